@@ -0,0 +1,81 @@
+"""
+Remembers check results on disk, so checking a model file that was already checked (a student
+resubmitting unchanged code, a grader re-running a batch) is answered right away.
+
+An entry is keyed by the hash of the model source, the level (class, version and whatever else
+decides how its checks go, like the portals of a Wormholes level, see Level._cache_settings),
+the seed, the number of trials and the number of workers (a parallel check draws other trials),
+and the cache drops the least recently used entries once it grows beyond its size limit.
+"""
+
+import hashlib
+import json
+import os
+
+import game_backend as gb
+
+DEFAULT_DIRECTORY = os.path.join(os.path.expanduser("~"), ".cache", "foundation-of-science", "checks")
+
+
+class CheckCache():
+    def __init__(self, directory: str = None, max_bytes: int = 16 * 2**20):
+        self.directory = directory or os.environ.get("FOUNDATION_OF_SCIENCE_CACHE", DEFAULT_DIRECTORY)
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+
+    def key(self, level, source, seed, trials=None, shrink=False, workers=1) -> str:
+        level_key = [type(level).__module__, type(level).__qualname__, level.version, level._cache_settings()]
+        if isinstance(source, str):
+            source = source.encode()
+        digest = hashlib.sha256(source)
+        # a parallel check draws other trials than a serial one, and they depend on the number of shards
+        workers = workers or os.cpu_count()
+        digest.update(json.dumps([level_key, seed, trials or level.trials, shrink, workers], sort_keys=True).encode())
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".json")
+
+    def get(self, key):
+        """ The cached result for `key` or None. """
+        try:
+            with open(self._path(key)) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        os.utime(self._path(key)) # most recently used
+        if set(entry) == {"passed"}: # levels with their own check only say passed or not
+            return entry["passed"]
+        return gb.CheckResult(**entry)
+
+    def put(self, key, result):
+        entry = vars(result) if isinstance(result, gb.CheckResult) else {"passed": bool(result)}
+        temporary = self._path(key) + ".tmp"
+        with open(temporary, "w") as f:
+            json.dump(entry, f)
+        os.replace(temporary, self._path(key))
+        self._evict()
+
+    def _evict(self):
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".json"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        size = sum(entry[1] for entry in entries)
+        for _, entry_size, path in sorted(entries):
+            if size <= self.max_bytes:
+                break
+            os.remove(path)
+            size -= entry_size
+
+    def check(self, level, source, run, seed: int = 0, trials: int = None, shrink: bool = False, workers: int = 1):
+        """ The cached result of checking the model with this `source`, or `run(seed=..., trials=..., shrink=...)`
+        (e.g. a bound level.check with the model) whose result gets cached. `workers` is only part of the key,
+        `run` is expected to check with that many itself. """
+        key = self.key(level, source, seed, trials, shrink, workers)
+        result = self.get(key)
+        if result is None:
+            result = run(seed=seed, trials=trials, shrink=shrink)
+            self.put(key, result)
+        return result
@@ -31,167 +31,32 @@ async def _(micropip):
 
 
 @app.cell
-def _(np):
-    def unit_vector(vector):
-        """ Returns the unit vector of the vector.  """
-        return vector / np.linalg.norm(vector)
-
-    def angle_between(v1, v2):
-        """ Returns the angle in radians between vectors 'v1' and 'v2'::
-
-                >>> angle_between((1, 0, 0), (0, 1, 0))
-                1.5707963267948966
-                >>> angle_between((1, 0, 0), (1, 0, 0))
-                0.0
-                >>> angle_between((1, 0, 0), (-1, 0, 0))
-                3.141592653589793
-        """
-        v1_u = unit_vector(v1)
-        v2_u = unit_vector(v2)
-        return np.arccos(np.clip(np.dot(v1_u, v2_u), -1.0, 1.0))
-
-    def nparr_to_list(arr):
-        return [int(i) for i in arr]
-    # ==============================================================
-
-    class Level():
-        known_points = {}
-
-        def __init__(self):
-            raise NotImplemented
-    
-        def description(self): # prints a description of the level,
-            # in particular how many dimensions and how the context of the model looks like
-            raise NotImplemented
-
-        def move(self, movement_vector):
-            raise NotImplemented
-
-        def save_point(self, name):
-            raise NotImplemented
-    
-        def measure_angle(self, left_point, right_point): # measuring the angle between two points and the current position
-            raise NotImplemented
-    
-        def check(self, model): # odel is a function that given the context (i.e. the position and where to move) and predicts how a state (i.e. the position) changes
-            raise NotImplemented
-
-    class Euclidean(Level):
-        def __init__(self, dim: int = 3):
-            self.dim = dim
-            self.dim_move = dim
-            self.position = np.zeros(dim)
-    
-        def description(self):
-            return """This level takes dim (usually 3) values as a movementvector and
-            expects the model to take a dim sized list position and a dim sized list movement_vector
-            it should return a dim sized list with the predicted new position
-        
-            so model should have type model(position: List(int), movement: List(int)) -> List(int) where every list is dim long"""
-    
-        def move(self, movement_vector: np.ndarray):
-            self.position += movement_vector
-    
-        def save_point(self, name: str):
-            self.known_points[name] = self.position.copy()
-
-        def measure_angle(self, left_point: str, right_point: str) -> int: # measuring the angle (in rad) between two points and the current position
-            a = self.known_points[left_point] - self.position
-            b = self.known_points[right_point] - self.position
-            return angle_between(a, b)
-
-        def measure_length(self, other_point) -> int:
-            return self.known_points[other_point]-self.position
-
-        def check(self, model):
-            for i in range(100):
-                pos = np.random.randint(-1000, 1000, self.dim)
-                move = np.random.randint(-1000, 1000, self.dim)
-                if nparr_to_list(pos+move) != model(nparr_to_list(pos), nparr_to_list(move)):
-                    return False
-            return True
-
-
-    class Elevator(Euclidean):
-        def __init__(self):
-            super().__init__()
-            self.dim_move = 2
-            self.known_points["check me out"] = np.array([1,2,0])
-    
-        def description(self):
-            return """In this level, positions are represented by 3-dimensional lists, while the movement vector by a 2-dimensional list. Given the current position and a movement vector, you need to predict the next position.
-        
-            `model` should have type `model(position: List(int), movement: List(int)) -> List(int)`"""
-
-        def solution_description(self):
-            return """The world seems to consist of a simple 2-dimensional plane, until you travel to `[1, 2, 0]`. Here, you get "teleported" to the parallel plane `z = 1`.
-
-    A possible solution is:
-    ```py
-    def model(position, movement):
-        for i in range(2):
-            position[i] += movement[i]
-        if position[0] == 1 and position[1] == 2:
-            position[2] = 1 - position[2]
-        return position
-    ```
-
-    You could think of `[1, 2, 0]` as a [wormhole](https://en.wikipedia.org/wiki/Wormhole), a hypothetical structure that connects seemingly desperate points in space. Fascinating about wormholes is that the mathematical framework of general relativity _allows for their existence_. Does this imply that they exist? Or that they could?
-
-    It has been pointed out that maths is [unreasonably effective](https://en.wikipedia.org/wiki/The_Unreasonable_Effectiveness_of_Mathematics_in_the_Natural_Sciences) at modelling the natural word. And indeed, when we try to model simple physics experiments, we often reach mathematical descriptions that apply to a large class of phenomena. Is there underlying truth to these models? Should we expect that mathematical possibilities in our models will translate to (yet-unobserved) physical phenomena?
-
-    Or should we always be careful not to mistake the map for the mountain? That is, (mathematical) models are useful as "maps" in as much as they predict how the world functions (i.e. show us the way through the mountains). But we should put little trust in maps of uncharted territories. Even if an elegant mathematical theory predicts some theoretical outcomes, should we only trust in it once we observe it empirically?"""
-    
-        def move(self, movement_vector: np.ndarray):
-            self.position += np.append(movement_vector, 0)
-            if np.all(self.position == self.known_points["check me out"]):
-                self.position += np.array([0,0,1])
-            elif list(self.position) == list(self.known_points["check me out"]+np.array([0,0,1])):
-                self.position -= np.array([0,0,1])
-    
-        def check(self, model):
-            save_position = self.position
-
-            for i in range(100):
-                pos = np.random.randint(-1000, 1000, 3)
-                self.position = pos.copy()
-                move = np.random.randint(-1000, 1000, 2)
-                self.move(move)
-                if nparr_to_list(self.position) != model(nparr_to_list(pos), nparr_to_list(move)):
-                    self.position = save_position
-                    return False
-        
-            for i in range(30):
-                pos = np.random.randint(-10, 10, 3)
-                self.position = pos.copy()
-                move = np.random.randint(-10, 10, 2)
-                self.move(move)
-                if nparr_to_list(self.position) != model(nparr_to_list(pos), nparr_to_list(move)):
-                    self.position = save_position
-                    return False
-        
-            pos = [30, 20, 1]
-            self.position = pos.copy()
-            move = [-29, -28]
-            self.move(move)
-            if nparr_to_list(self.position) != model(nparr_to_list(pos), nparr_to_list(move)):
-                self.position = save_position
-                return False
-        
-            pos = [30, 20, 0]
-            self.position = pos.copy()
-            move = [-29, -28]
-            self.move(move)
-            if nparr_to_list(self.position) != model(nparr_to_list(pos), nparr_to_list(move)):
-                self.position = save_position
-                return False
-        
-            # TODO can not test position at "check me out" and move 0 as this is not testable for user
-            # TODO wrong, they can stand still on that spot, but maybe hard to guess
-
-            self.position = save_position
-            return True
-    return (Elevator,)
+def _():
+    import sys
+
+    # in the browser (pyodide) game_backend.py is not on the path, it is fetched
+    # from the site like game_interface.py does it; locally it is imported
+    in_browser = sys.platform == "emscripten"
+    if in_browser:
+        from pyodide.http import open_url
+        from importlib.util import spec_from_loader, module_from_spec
+
+        def _load_module_from_url(name: str, url: str):
+            code = open_url(url).read()
+            module_spec = spec_from_loader(name, loader=None)
+            module = module_from_spec(module_spec)
+            exec(code, module.__dict__)
+            return module
+
+        # Hack to make it work both locally and on github pages
+        base_url = "/marimo/game_backend.py"
+        try:
+            gb = _load_module_from_url("gb", "/foundation-of-science-game/"+base_url)
+        except:
+            gb = _load_module_from_url("gb", base_url)
+    else:
+        import game_backend as gb
+    return gb, in_browser
 
 
 @app.cell
@@ -204,9 +69,9 @@ def _(mo):
 
 
 @app.cell
-def _(Elevator, mo):
+def _(gb, mo):
     # Initialize your level and store it in state
-    get_lvl, set_lvl = mo.state(Elevator())
+    get_lvl, set_lvl = mo.state(gb.Elevator())
     return get_lvl, set_lvl
 
 
@@ -216,6 +81,14 @@ def _(get_lvl):
     return (lvl,)
 
 
+@app.cell
+def _(np):
+    # drawn once per session: the checks do not always run the same trials,
+    # but checking unchanged code again is still answered from the cache
+    check_seed = int(np.random.SeedSequence().entropy % 2**32)
+    return (check_seed,)
+
+
 @app.cell
 def _(lvl, mo):
     mo.md(f"""
@@ -274,20 +147,19 @@ def _(mo, move_btn, position, save_btn, save_name, x_move, y_move):
 
 
 @app.cell(hide_code=True)
-def _(lvl, np):
+def _(lvl):
     import plotly.graph_objects as go
 
     def create_3d_plot(lvl):
-        points_dict = lvl.known_points
+        points = lvl.known_points
 
         fig = go.Figure()
 
         # 1. Add the points
-        if points_dict:
-            # Extracting coordinates for all points
-            pts_list = list(points_dict.values())
-            pts = np.array(pts_list)
-            names = list(points_dict.keys())
+        if points:
+            # every saved point is shown, the player named each one on purpose
+            pts = points.array
+            names = points.names
 
             fig.add_trace(go.Scatter3d(
                 x=pts[:, 0], y=pts[:, 1], z=pts[:, 2],
@@ -349,8 +221,8 @@ def _(mo):
 
 
 @app.cell
-def _(lvl, mo, user_code):
-    def run_user_validation(code_string, check):
+def _(check_seed, in_browser, lvl, mo, user_code):
+    def run_user_validation(code_string, check_iter):
         namespace = {}
 
         try:
@@ -363,17 +235,31 @@ def _(lvl, mo, user_code):
 
             user_model = namespace["model"]
 
-            success = check(user_model)
+            def run(**check_args):
+                # one batch at a time, so the page shows how far the check got instead of freezing
+                with mo.status.progress_bar(total=check_args.get("trials") or lvl.trials, title="Checking your model") as bar:
+                    shown = 0
+                    for progress in check_iter(user_model, batch=20, **check_args):
+                        bar.update(increment=progress.done - shown, subtitle=str(progress))
+                        shown = progress.done
+                return progress.result
+
+            if in_browser: # no disk to keep a cache on
+                success = run(seed=check_seed, shrink=True)
+            else:
+                # unchanged code was already checked, the cache knows the answer
+                from check_cache import CheckCache
+                success = CheckCache().check(lvl, code_string, run, seed=check_seed, shrink=True)
 
             if success:
                 return mo.md(f"✅ **Success**!: Your model correctly predicts the level's behavior.\n\n {lvl.solution_description()}")
             else:
-                return mo.md("❌ **Validation Failed**: The model did not return the expected values for random trials.")
+                return mo.md(f"❌ **Validation Failed**: The model did not return the expected values for random trials.\n\n Hint: {success.hint()}")
 
         except Exception as e:
             return mo.md(f"🛑 **Syntax or Runtime Error**: `{type(e).__name__}: {str(e)}`")
 
-    validation_result = run_user_validation(user_code.value, lvl.check)
+    validation_result = run_user_validation(user_code.value, lvl.check_iter)
     validation_result
     return
 
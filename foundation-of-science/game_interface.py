@@ -55,7 +55,7 @@ def _(mo):
     # TODO I know this is incredibly insecure. I should add validation later when I have a list of levels
     exec(f"currentLevel = gb.{url_params["level"]}") 
 
-    return (currentLevel,)
+    return currentLevel, gb
 
 
 @app.cell
@@ -140,21 +140,20 @@ def _(mo, move_btn, position, save_btn, save_name, x_move, y_move):
 
 
 @app.cell(hide_code=True)
-def _(lvl, np):
+def _(lvl):
     import plotly.graph_objects as go
 
     # TODO for 2D level other plot possibility
     def create_3d_plot(lvl):
-        points_dict = lvl.known_points
+        points = lvl.known_points
 
         fig = go.Figure()
 
         # 1. Add the points
-        if points_dict:
-            # Extracting coordinates for all points
-            pts_list = list(points_dict.values())
-            pts = np.array(pts_list)
-            names = list(points_dict.keys())
+        if points:
+            # every saved point is shown, the player named each one on purpose
+            pts = points.array
+            names = points.names
 
             fig.add_trace(go.Scatter3d(
                 x=pts[:, 0], y=pts[:, 1], z=pts[:, 2],
@@ -217,7 +216,7 @@ def _(mo):
 
 
 @app.cell
-def _(lvl, mo, user_code):
+def _(gb, lvl, mo, user_code):
     def run_user_validation(code_string, check):
         namespace = {}
         # TODO Validate more of how the function has to be (list length etc) before passing to validation
@@ -231,11 +230,24 @@ def _(lvl, mo, user_code):
 
             user_model = namespace["model"]
 
-            success = check(user_model)
+            if type(lvl).check is gb.Level.check:
+                # one batch at a time, so the page shows how far the check got instead of freezing
+                with mo.status.progress_bar(total=lvl.trials, title="Checking your model") as bar:
+                    shown = 0
+                    for progress in lvl.check_iter(user_model, batch=20):
+                        bar.update(increment=progress.done - shown, subtitle=str(progress))
+                        shown = progress.done
+                success = progress.result
+            else: # levels with their own check can not report progress
+                success = check(user_model)
 
             if success:
                 return mo.md(f"✅ **Success**!: Your model correctly predicts the level's behavior.\n\n {lvl.solution_description()}")
-            else:
+            elif hasattr(success, "hint"):
+                # a smaller trial the model still gets wrong makes a better hint
+                lvl.shrink(user_model, success)
+                return mo.md(f"❌ **Validation Failed**: The model did not return the expected values for random trials.\n\n Hint: {success.hint()}")
+            else: # levels with their own check only say passed or not
                 return mo.md("❌ **Validation Failed**: The model did not return the expected values for random trials.")
 
         except Exception as e:
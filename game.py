@@ -2,8 +2,6 @@
 # It should provide explanations and background
 
 # The main technical question for me right now whether it would be possible to open a python REPL with the context of the given level so that it can be explored automatically
-from terminal_interface import CLI
-from game_backend import Euclidean, Elevator, SimpleTime, Spherical
 
 # TODO for wintercamp: In German + in Grad nicht in rad
 print("Welcome to this game, the idea is to give some intuition about how scientific progress, in the sense of creating models of the world around us works")
@@ -15,6 +13,11 @@ print("At the beginning of each level (or using help) you will be given a functi
 print()
 print("BACKGROUND: This is also where this game deviates from actual science: There you have no way to verify the model against the ground truth, so one can never be sure whether the model is actually correct. But more on this shortly")
 
+# imported only now, so the text above shows up before numpy and the levels are loaded
+# (all levels live in game_backend, which the CLI imports anyway)
+from terminal_interface import CLI
+from game_backend import Euclidean, Elevator, SimpleTime, Spherical, Hyperbolic
+
 # Euclidean Level
 cli = CLI(Euclidean())
 cli.start()
@@ -32,4 +35,9 @@ cli.start()
 # Sphere
 print("The ancient Greeks had a lot of nice geometry, but let's try something newer")
 cli = CLI(Spherical())
-cli.start()
\ No newline at end of file
+cli.start()
+
+# Saddle
+print("A closed surface was not too hard. What about a surface that opens up in every direction?")
+cli = CLI(Hyperbolic())
+cli.start()
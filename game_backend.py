@@ -1,5 +1,7 @@
 import numpy as np
 import random
+import os
+import time
 
 # from https://stackoverflow.com/questions/2827393/angles-between-two-n-dimensional-vectors-in-python
 def unit_vector(vector):
@@ -20,12 +22,449 @@ def angle_between(v1, v2):
     v2_u = unit_vector(v2)
     return np.arccos(np.clip(np.dot(v1_u, v2_u), -1.0, 1.0))
 
+def _pairwise_angles(vectors):
+    """ The angle between every pair of the (..., P, k) vectors, as (..., P, P). Pairs with a zero
+    vector are NaN, the diagonal is exactly 0 instead of rounding noise (NaN stays NaN). """
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        units = np.where(norms == 0, np.nan, vectors / norms)
+    angles = np.arccos(np.clip(units @ np.swapaxes(units, -1, -2), -1.0, 1.0))
+    diagonal = np.arange(angles.shape[-1])
+    angles[..., diagonal, diagonal] *= 0
+    return angles
+
 def nparr_to_list(arr):
     return [int(i) for i in arr]
+
+def vectorized(model):
+    """ Marks `model` as vectorized: check then calls it once with an (N, dim) array of
+    positions and an (N, dim_move) array of movements and expects the (N, dim) array of
+    predicted positions back, instead of calling it once per trial with lists.
+
+            >>> @vectorized
+            ... def model(positions, movements):
+            ...     return positions + movements
+    """
+    model.vectorized = True
+    return model
+
+def downsample(path, limit: int) -> np.ndarray:
+    """ Indices of at most `limit` rows (2 dim + 2 for very small limits) of the (n, dim) `path`
+    that keep its shape when plotted (min/max per bucket): the first and last row, and in each
+    of (limit - 2) // (2 dim) equally long stretches in between the rows with the smallest and
+    the largest value of every coordinate. Sorted, and all rows while there are no more than
+    `limit`::
+
+            >>> downsample([[0], [3], [1], [2], [-1], [0]], 4)
+            array([0, 1, 4, 5])
+    """
+    path = np.asarray(path)
+    n, dim = path.shape
+    if n <= limit:
+        return np.arange(n)
+    buckets = max((limit - 2) // (2 * dim), 1)
+    size = -(-(n - 2) // buckets)
+    inner = path[1:-1]
+    # the last bucket is filled up with copies of the last row, argmin and argmax take the first one
+    padded = np.concatenate([inner, np.repeat(inner[-1:], buckets * size - len(inner), axis=0)])
+    # (buckets, dim, size), so argmin and argmax run over contiguous memory
+    padded = np.ascontiguousarray(padded.reshape(buckets, size, dim).transpose(0, 2, 1))
+    start = np.arange(buckets)[:, None] * size
+    extremes = np.concatenate([padded.argmin(axis=2) + start, padded.argmax(axis=2) + start])
+    return np.unique(np.concatenate([[0], np.minimum(extremes.ravel(), n - 3) + 1, [n - 1]]))
+
+def principal_axes(points, k: int = 2):
+    """ The mean of the (n, dim) `points` and the (dim, k) directions they spread out the most
+    along (principal components), so `(points - mean) @ axes` shows as much of them as k
+    coordinates can. Each direction points where its largest component is positive. """
+    points = np.asarray(points, dtype=float)
+    mean = points.mean(axis=0)
+    centred = points - mean
+    _, vectors = np.linalg.eigh(centred.T @ centred) # ascending
+    axes = vectors[:, ::-1][:, :k]
+    return mean, axes * np.sign(axes[np.abs(axes).argmax(axis=0), np.arange(axes.shape[1])])
+
+class PointStore():
+    """ The saved points of a level, by name. All coordinates live in one contiguous (n, dim)
+    array that grows by doubling, the names only map to their row in it::
+
+            >>> points = PointStore(2)
+            >>> points["home"] = [1, 2]
+            >>> points.names, points.array
+            (['home'], array([[1., 2.]]))
+    """
+    def __init__(self, dim: int, dtype=float, capacity: int = 8):
+        self._points = np.empty((capacity, dim), dtype=dtype)
+        self._rows = {}
+
+    def __setitem__(self, name: str, point):
+        row = self._rows.get(name)
+        if row is None:
+            row = len(self._rows)
+            if row == len(self._points):
+                self._points = np.concatenate([self._points, np.empty_like(self._points)])
+            self._rows[name] = row
+        self._points[row] = point
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        # a copy, like a dict of arrays gives: saving under the same name again does not change it
+        return self._points[self._rows[name]].copy()
+
+    def __contains__(self, name):
+        return name in self._rows
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    def __len__(self):
+        return len(self._rows)
+
+    def keys(self):
+        return self._rows.keys()
+
+    def values(self):
+        return list(self.array.copy())
+
+    def items(self):
+        return zip(self.names, self.array.copy())
+
+    @property
+    def names(self) -> list:
+        return list(self._rows)
+
+    @property
+    def array(self) -> np.ndarray:
+        # read only view of all saved points, row i belongs to names[i] (the only view, everything else copies)
+        points = self._points[:len(self._rows)]
+        points.flags.writeable = False
+        return points
+
+    def row(self, name: str) -> int:
+        return self._rows[name]
+
+    def snapshot(self):
+        copy = PointStore.__new__(PointStore)
+        copy._points = self._points[:max(len(self._rows), 1)].copy()
+        copy._rows = dict(self._rows)
+        return copy
+
+class CellIndex():
+    """ A set of integer grid cells (points with integer coordinates). Every cell is packed
+    into one int64 key and kept in an open addressing hash table, so testing one cell is O(1)
+    and N cells are tested in one vectorized pass. Adding a cell twice keeps it once::
+
+            >>> cells = CellIndex(2)
+            >>> cells.update([[1, 2], [3, 4], [1, 2]])
+            >>> len(cells), [1, 2] in cells, cells.contains([[3, 4], [0, 0]])
+            (2, True, array([ True, False]))
+    """
+    _EMPTY = np.iinfo(np.int64).min
+    _MULTIPLIER = 0x9E3779B97F4A7C15 # fibonacci hashing
+
+    def __init__(self, dim: int, capacity: int = 16):
+        self.dim = dim
+        self._bits = 63 // dim # per coordinate, coordinates have to be within ±2**(bits-1)
+        self._cells = np.empty((capacity, dim), dtype=np.int64) # in insertion order
+        self._size = 0
+        self._allocate(16)
+
+    def _allocate(self, slots: int):
+        self._shift = 64 - (slots.bit_length() - 1)
+        self._keys = np.full(slots, self._EMPTY, dtype=np.int64)
+        self._rows = np.full(slots, -1, dtype=np.int64)
+
+    def _pack(self, cells: np.ndarray):
+        # keys of the cells and whether they can be represented at all
+        offset = 1 << (self._bits - 1)
+        valid = np.all((cells >= -offset) & (cells < offset), axis=1)
+        shifted = np.where(valid[:, None], cells + offset, 0).astype(np.int64)
+        keys = np.zeros(len(cells), dtype=np.int64)
+        for i in range(self.dim):
+            keys |= shifted[:, i] << (self._bits * i)
+        return keys, valid
+
+    def _slots(self, keys: np.ndarray) -> np.ndarray:
+        return ((keys.astype(np.uint64) * np.uint64(self._MULTIPLIER)) >> np.uint64(self._shift)).astype(np.intp)
+
+    def _as_cells(self, cells) -> np.ndarray:
+        cells = np.asarray(cells).reshape(-1, self.dim)
+        if cells.dtype.kind == "f":
+            integral = np.all(cells == np.round(cells), axis=1)
+            cells = np.where(integral[:, None], cells, np.inf) # never a cell, so never contained
+        return cells
+
+    def rows(self, cells) -> np.ndarray: # insertion index of every cell, -1 for cells not in the set
+        keys, valid = self._pack(self._as_cells(cells))
+        rows = np.full(len(keys), -1, dtype=np.int64)
+        slots = self._slots(keys)
+        pending = np.flatnonzero(valid)
+        while len(pending):
+            found = self._keys[slots[pending]]
+            hit = found == keys[pending]
+            rows[pending[hit]] = self._rows[slots[pending[hit]]]
+            pending = pending[~hit & (found != self._EMPTY)]
+            slots[pending] = (slots[pending] + 1) % len(self._keys)
+        return rows
+
+    def contains(self, cells) -> np.ndarray: # vectorized `in`: which of these N cells are in the set
+        return self.rows(cells) >= 0
+
+    def row(self, cell) -> int: # `rows` for a single cell, which is faster in plain python than as an array
+        offset = 1 << (self._bits - 1)
+        key = 0
+        for i, c in enumerate(cell):
+            if not (-offset <= c < offset and c == int(c)):
+                return -1
+            key |= (int(c) + offset) << (self._bits * i)
+        slot = ((key * self._MULTIPLIER) & 0xFFFFFFFFFFFFFFFF) >> self._shift
+        while True:
+            found = self._keys[slot]
+            if found == key:
+                return int(self._rows[slot])
+            if found == self._EMPTY:
+                return -1
+            slot = (slot + 1) % len(self._keys)
+
+    def __contains__(self, cell):
+        return self.row(cell) >= 0
+
+    def _insert(self, keys: np.ndarray, rows: np.ndarray):
+        # keys have to be new and unique; colliding keys move on one slot per round
+        slots = self._slots(keys)
+        pending = np.arange(len(keys))
+        while len(pending):
+            free = self._keys[slots[pending]] == self._EMPTY
+            targets, first = np.unique(slots[pending[free]], return_index=True)
+            placed = pending[free][first]
+            self._keys[targets] = keys[placed]
+            self._rows[targets] = rows[placed]
+            pending = np.setdiff1d(pending, placed, assume_unique=True)
+            slots[pending] = (slots[pending] + 1) % len(self._keys)
+
+    def update(self, cells):
+        cells = self._as_cells(cells)
+        keys, valid = self._pack(cells)
+        if not valid.all():
+            raise ValueError("cells need integer coordinates within ±%d" % (1 << (self._bits - 1)))
+        keys, first = np.unique(keys, return_index=True)
+        new = self.rows(cells[first]) < 0
+        keys, cells = keys[new], cells[first][new]
+        order = np.argsort(first[new]) # keep the insertion order of the input
+        keys, cells = keys[order], cells[order]
+
+        size = self._size + len(keys)
+        if size > len(self._cells):
+            grown = np.empty((max(size, 2 * len(self._cells)), self.dim), dtype=np.int64)
+            grown[:self._size] = self._cells[:self._size]
+            self._cells = grown
+        self._cells[self._size:size] = cells
+        if 2 * size > len(self._keys): # keep the table at most half full
+            slots = len(self._keys)
+            while 2 * size > slots:
+                slots *= 2
+            self._allocate(slots)
+            old_keys, _ = self._pack(self._cells[:self._size])
+            self._insert(old_keys, np.arange(self._size))
+        self._insert(keys, np.arange(self._size, size))
+        self._size = size
+
+    def add(self, cell):
+        self.update(cell)
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        return iter(map(tuple, self.array.tolist()))
+
+    @property
+    def array(self) -> np.ndarray:
+        # read only (n, dim) view of all cells in the order they were added
+        cells = self._cells[:self._size]
+        cells.flags.writeable = False
+        return cells
+
+class ObservationField():
+    """ An endless world of things to observe. Whether a cell has something in it is decided by
+    hashing the cell together with the seed, so the same seed always gives the same world and no
+    cell has to be stored up front. Cells that are looked at one by one are computed a whole
+    chunk at a time and cached, so memory only grows with the regions that were visited. """
+    def __init__(self, seed: int, density: float = 0.4, chunk: int = 64):
+        self.seed = seed
+        self.density = density # share of the cells with something in them
+        self.chunk = chunk
+        self._chunks = {} # (chunk x, chunk y) -> (chunk, chunk) bool array
+
+    def contains(self, points) -> np.ndarray: # which of these (N, 2) points have something to observe
+        points = np.asarray(points).reshape(-1, 2)
+        integral = np.all(points == np.round(points), axis=1)
+        cells = np.where(integral[:, None], points, 0).astype(np.int64).astype(np.uint64)
+        # splitmix64 finalizer on a mix of seed and cell
+        z = np.uint64(self.seed & 0xFFFFFFFFFFFFFFFF) + cells[:, 0] * np.uint64(0x9E3779B97F4A7C15) + cells[:, 1] * np.uint64(0xC2B2AE3D27D4EB4F)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        z = z ^ (z >> np.uint64(31))
+        return integral & (z < np.uint64(int(self.density * 2.0**64)))
+
+    def _chunk(self, cx: int, cy: int) -> np.ndarray:
+        chunk = self._chunks.get((cx, cy))
+        if chunk is None:
+            x, y = np.meshgrid(np.arange(self.chunk) + cx * self.chunk, np.arange(self.chunk) + cy * self.chunk, indexing="ij")
+            chunk = self.contains(np.column_stack([x.ravel(), y.ravel()])).reshape(self.chunk, self.chunk)
+            self._chunks[(cx, cy)] = chunk
+        return chunk
+
+    def explore(self, low, high): # computes and caches all chunks touching the box from low to high (inclusive)
+        for cx in range(int(low[0]) // self.chunk, int(high[0]) // self.chunk + 1):
+            for cy in range(int(low[1]) // self.chunk, int(high[1]) // self.chunk + 1):
+                self._chunk(cx, cy)
+
+    def __contains__(self, cell):
+        x, y = cell
+        if x != int(x) or y != int(y):
+            return False
+        x, y = int(x), int(y)
+        return bool(self._chunk(x // self.chunk, y // self.chunk)[x % self.chunk, y % self.chunk])
+
+    @property
+    def array(self) -> np.ndarray:
+        # (n, 2) array of everything observed in the explored chunks
+        cells = [np.argwhere(chunk) + np.array(key) * self.chunk for key, chunk in self._chunks.items()]
+        return np.concatenate(cells) if cells else np.empty((0, 2), dtype=np.int64)
+
+    def __iter__(self):
+        return iter(map(tuple, self.array.tolist()))
+
+    def __len__(self):
+        return int(sum(chunk.sum() for chunk in self._chunks.values()))
+
+class CheckResult():
+    """ What Level.check found out. It is truthy exactly when the model passed, when it failed it
+    also carries the first failing trial (and in a parallel check the shard it belongs to). """
+    def __init__(self, passed: bool, trials: int, position=None, movement=None, expected=None, shard=None, trial=None,
+                 region=None, coverage=None, shrunk=None, error=None):
+        self.passed = passed
+        self.trials = trials # how many trials were run
+        self.position = position
+        self.movement = movement
+        self.expected = expected
+        self.shard = shard
+        self.trial = trial # index of the failing trial within its shard
+        self.region = region # region of the failing trial
+        self.coverage = coverage # how many trials were run of each region of the level
+        self.shrunk = shrunk # a smaller failing trial found by Level.shrink, with what the model predicted there
+        self.error = error # what the model raised on the failing trial, if it raised
+
+    def __bool__(self):
+        return self.passed
+
+    def __str__(self):
+        if self.passed:
+            return f"passed ({self.trials} trials)"
+        where = f"trial {self.trial}" + ("" if self.shard is None else f" of shard {self.shard}")
+        if self.region is not None:
+            where += f" ({self.region})"
+        raised = "" if self.error is None else f", the model raised {self.error}"
+        return f"failed at {where}: position {self.position}, movement {self.movement}, expected {self.expected}{raised}"
+
+    def coverage_report(self) -> str:
+        if not self.coverage:
+            return ""
+        return ", ".join(f"{region}: {count}" for region, count in self.coverage.items())
+
+    def hint(self) -> str:
+        """ Where the model goes wrong, in words, preferring the shrunk trial if there is one. """
+        if self.passed:
+            return ""
+        trial = self.shrunk or {"position": self.position, "movement": self.movement, "expected": self.expected}
+        hint = f"starting at {trial['position']} and moving by {trial['movement']} should end at {trial['expected']}"
+        if trial.get("predicted") is not None:
+            hint += f", but the model says {trial['predicted']}"
+        elif self.error is not None:
+            hint += f", but the model raises {self.error}"
+        return hint
+
+    def __repr__(self):
+        return f"CheckResult({self})"
+
+
+_shard = None # (level, model, lowest failing shard) of a worker process in check_parallel
+
+class CheckProgress():
+    """ How far Level.check_iter got. `result` is the CheckResult once the check is over, None before. """
+    def __init__(self, done: int, trials: int, wrong: int, elapsed: float, result=None):
+        self.done = done # trials run so far
+        self.trials = trials # trials the check will run at most
+        self.wrong = wrong # trials the model got wrong so far
+        self.elapsed = elapsed # seconds since the check started
+        self.result = result
+
+    @property
+    def rate(self) -> float:
+        """ Fraction of the trials so far the model got right. """
+        return (self.done - self.wrong) / self.done if self.done else 1.0
+
+    def __str__(self):
+        return f"{self.done}/{self.trials} trials, {self.rate:.1%} right, {self.elapsed:.1f} s"
+
+class _ShardStop():
+    # the stop "event" of one shard in check_parallel: set once a shard with a lower index failed
+    def __init__(self, failed, index):
+        self.failed = failed
+        self.index = index
+
+    def is_set(self):
+        return self.failed.value < self.index
+
+def _init_shard(level, model, failed):
+    global _shard
+    _shard = (level, model, failed)
+
+def _run_shard(index, trials, seed):
+    level, model, failed = _shard
+    result = level._check_shard(model, trials, np.random.default_rng(seed), _ShardStop(failed, index), index)
+    if not result:
+        with failed.get_lock():
+            failed.value = min(failed.value, index)
+    return result
+
+def check_parallel(level, model, trials: int = None, seed: int = None, workers: int = None) -> CheckResult:
+    """ Runs level.check(model) spread over `workers` processes (default: one per core). Every
+    shard draws its trials from its own SeedSequence.spawn stream. Once a shard finds a
+    counterexample the shards after it stop, the ones before it still finish, and the failure
+    of the first failing shard is reported, so a seed reproduces the whole result. """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    trials = trials or level.trials
+    workers = workers or os.cpu_count()
+    # forking hands the model over as is, models loaded from a file can not be pickled
+    context = multiprocessing.get_context("fork" if "fork" in multiprocessing.get_all_start_methods() else None)
+    failed = context.Value("i", workers) # index of the first shard that failed so far
+    seeds = np.random.SeedSequence(seed).spawn(workers)
+
+    with ProcessPoolExecutor(workers, mp_context=context, initializer=_init_shard, initargs=(level, model, failed)) as pool:
+        futures = [pool.submit(_run_shard, i, trials // workers + (i < trials % workers), seeds[i]) for i in range(workers)]
+        results = [future.result() for future in futures]
+    # the shards after the first failing one stopped at some random point, they do not count
+    first = next((i for i, result in enumerate(results) if not result), None)
+    results = results if first is None else results[:first + 1]
+    coverage = {}
+    for result in results:
+        for region, count in (result.coverage or {}).items():
+            coverage[region] = coverage.get(region, 0) + count
+    if first is not None:
+        results[first].coverage = coverage
+        return results[first]
+    return CheckResult(True, sum(result.trials for result in results), coverage=coverage)
+
 # ==============================================================
 
 class Level():
-    known_points = {}
+    trials = 100 # how many random trials check uses by default
+    dtype = np.int64 # of positions and movements, levels on a lattice count in whole steps
+    fixed_columns = () # position columns that are the same in every trial, shrink leaves them alone
+    version = 3 # increase when the behaviour of a level changes, this invalidates cached check results
 
     def __init__(self):
         raise NotImplemented
@@ -41,20 +480,282 @@ class Level():
     def move(self, movement_vector):
         raise NotImplemented
 
+    def move_path(self, movements): # applies the (K, dim_move) movements one after the other and returns every visited position
+        path = []
+        for movement in movements:
+            self.move(movement)
+            path.append(np.array(self.position, copy=True))
+        return np.array(path).reshape(len(path), np.size(self.position))
+
     def save_point(self, name):
         raise NotImplemented
     
     def measure_angle(self, left_point, right_point): # measuring the angle between two points and the current position
         raise NotImplemented
     
-    def check(self, model): # odel is a function that given the context (i.e. the position and where to move) and predicts how a state (i.e. the position) changes
+    def _cache_settings(self) -> dict: # everything besides the class that decides what a check of this level finds, for CheckCache's key
+        return {name: getattr(self, name) for name in ("dim", "dim_move", "r") if hasattr(self, name)}
+
+    def regions(self): # the kinds of trials check draws from, as (name, weight, sampler) where sampler(n, rng) returns n positions and movements
+        raise NotImplementedError
+
+    def sample_regions(self, n, rng):
+        # n trials spread over the regions by weight, every region gets at least one if n allows;
+        # returns positions, movements and the index of the region of every trial, in random order
+        # so a check that stops early has not only tried the first regions
+        regions = self.regions()
+        weights = np.array([weight for _, weight, _ in regions], dtype=float)
+        counts = np.ones(len(regions), dtype=int) if n >= len(regions) else np.zeros(len(regions), dtype=int)
+        counts += rng.multinomial(n - counts.sum(), weights / weights.sum())
+        samples = [sampler(count, rng) for (_, _, sampler), count in zip(regions, counts)]
+        order = rng.permutation(int(counts.sum()))
+        return (np.concatenate([positions for positions, _ in samples])[order], np.concatenate([movements for _, movements in samples])[order],
+                np.repeat(np.arange(len(regions)), counts)[order])
+
+    def sample_trials(self, n, rng): # draws n random trials as a (n, dim) array of positions and a (n, dim_move) array of movements
+        positions, movements, _ = self.sample_regions(n, rng)
+        return positions, movements
+
+    def move_batch(self, positions, movements): # ground truth for many independent trials at once, returns the (N, dim) array of new positions
         raise NotImplemented
 
+    def move_many(self, positions, movements): # `move` for many instances at once: their (N, dim) positions after each moved by its row of movements
+        return self.move_batch(positions, movements)
+
+    def _embed(self, positions): # the vectors measurements work with, for a (..., dim) array of positions
+        raise NotImplementedError
+
+    def _lengths(self, points, current): # measure_length of the embedded (..., P, k) points seen from the embedded (..., k) current position
+        raise NotImplementedError
+
+    def _directions(self, points, current): # vectors from the embedded current position towards the points, measure_angle is the angle between two of them
+        return points - current[..., None, :]
+
+    def compare_batch(self, expected, predicted): # boolean mask of the trials where the prediction is right
+        return np.all(expected == predicted, axis=1)
+
+    def _typed(self, values) -> np.ndarray: # values as an array of the level's dtype, ValueError for values it can not hold (like 1.5 on a lattice)
+        values = np.asarray(values)
+        typed = values.astype(self.dtype)
+        if not np.array_equal(typed, values):
+            raise ValueError(f"this level only takes {np.dtype(self.dtype).name} values, got {values}")
+        return typed
+
+    def _shown(self, predicted): # a prediction the way a hint shows it: a list in the level's dtype if possible, else its repr
+        try:
+            values = np.asarray(predicted, dtype=float)
+        except (TypeError, ValueError):
+            return repr(predicted) # not even a position
+        if values.ndim != 1:
+            return repr(predicted)
+        with np.errstate(invalid="ignore"):
+            typed = values.astype(self.dtype)
+        return (typed if np.array_equal(typed, values) else values).tolist()
+
+    def _model_input(self, arr): # the plain lists a model gets, one per row of a 2-D array, converted all at once
+        return np.asarray(arr, dtype=self.dtype).tolist()
+
+    def _mismatches(self, expected, predicted):
+        # boolean mask of the wrong ones among a list of predictions, compared as one array when they form one
+        try:
+            array = np.asarray(predicted, dtype=float)
+        except (TypeError, ValueError):
+            array = None
+        if array is not None and array.shape == expected.shape:
+            return ~self.compare_batch(expected, array)
+        return np.array([not self._matches(e, p) for e, p in zip(expected, predicted)], dtype=bool)
+
+    def _matches(self, expected, predicted):
+        try:
+            predicted = np.asarray(predicted, dtype=float)
+        except (TypeError, ValueError):
+            return False
+        return predicted.shape == expected.shape and bool(self.compare_batch(expected[None], predicted[None])[0])
+
+    def _wrong(self, model, positions, movements, raising_is_wrong: bool = False):
+        # boolean mask of the trials the model gets wrong; a model that raises raises here too,
+        # unless `raising_is_wrong` (then the trial it raised on, or the whole batch for a vectorized one, is wrong)
+        expected = self.move_batch(positions, movements)
+        if getattr(model, "vectorized", False):
+            try:
+                predicted = model(positions.copy(), movements.copy())
+            except Exception:
+                if not raising_is_wrong:
+                    raise
+                return np.ones(len(positions), dtype=bool)
+            try:
+                predicted = np.asarray(predicted, dtype=float)
+            except (TypeError, ValueError):
+                return np.ones(len(positions), dtype=bool)
+            if predicted.shape != expected.shape:
+                return np.ones(len(positions), dtype=bool)
+            return ~self.compare_batch(expected, predicted)
+        if not raising_is_wrong:
+            return self._mismatches(expected, [model(p, m) for p, m in zip(self._model_input(positions), self._model_input(movements))])
+        predicted = []
+        for position, movement in zip(self._model_input(positions), self._model_input(movements)):
+            try:
+                predicted.append(model(position, movement))
+            except Exception:
+                predicted.append(None) # never matches
+        return self._mismatches(expected, predicted)
+
+    def _first_failure(self, model, positions, movements):
+        # index of the first trial the model gets wrong (None if it gets all of them right) and what the
+        # model raised there as "Type: message" (None if it did not raise); raising counts as getting it wrong
+        if getattr(model, "vectorized", False):
+            try:
+                wrong = self._wrong(model, positions, movements)
+            except Exception as e: # for the whole batch at once, so the first trial is as good as any
+                return 0, f"{type(e).__name__}: {e}"
+            return (int(np.argmax(wrong)) if wrong.any() else None), None
+
+        expected = self.move_batch(positions, movements)
+        predicted = []
+        try:
+            for position, movement in zip(self._model_input(positions), self._model_input(movements)):
+                predicted.append(model(position, movement))
+        except Exception as e:
+            # a trial the model got wrong before it raised is still the first failure
+            wrong = self._mismatches(expected[:len(predicted)], predicted)
+            if wrong.any():
+                return int(np.argmax(wrong)), None
+            return len(predicted), f"{type(e).__name__}: {e}"
+        wrong = self._mismatches(expected, predicted)
+        return (int(np.argmax(wrong)) if wrong.any() else None), None
+
+    def _check_batches(self, model, trials, rng, stop=None, shard=None, batch=None, keep_going=False):
+        # runs the trials in batches, so memory stays bounded and a check can be stopped in between;
+        # yields (trials done, trials wrong, None) after every batch and (.., .., CheckResult) at the end
+        batch = batch or (100_000 if getattr(model, "vectorized", False) else 1_000)
+        names = [name for name, _, _ in self.regions()]
+        covered = np.zeros(len(names), dtype=int)
+        done = wrong = 0
+        result = None
+        while done < trials and not (stop is not None and stop.is_set()):
+            positions, movements, regions = self.sample_regions(min(batch, trials - done), rng)
+            if keep_going:
+                mask = self._wrong(model, positions, movements, raising_is_wrong=True)
+                failure, error = (int(np.argmax(mask)) if mask.any() else None), None
+                seen = len(positions)
+                wrong += int(mask.sum())
+            else:
+                failure, error = self._first_failure(model, positions, movements)
+                seen = len(positions) if failure is None else failure + 1
+                wrong += failure is not None
+            covered += np.bincount(regions[:seen], minlength=len(names))
+            if failure is not None and result is None:
+                result = self._failed(positions, movements, failure, done, shard)
+                result.region = names[regions[failure]]
+                result.error = error
+            done += seen
+            if result is not None and not keep_going:
+                break
+            yield done, wrong, None
+        if result is None:
+            result = CheckResult(True, done, shard=shard)
+        result.trials = done
+        result.coverage = dict(zip(names, covered.tolist()))
+        yield done, wrong, result
+
+    def _check_shard(self, model, trials, rng, stop=None, shard=None):
+        for _, _, result in self._check_batches(model, trials, rng, stop, shard):
+            pass
+        return result
+
+    def _failed(self, positions, movements, failure, done, shard=None):
+        # CheckResult for trial `failure` of a batch that started after `done` other trials
+        expected = self.move_batch(positions[failure:failure+1], movements[failure:failure+1])[0]
+        return CheckResult(False, done + failure + 1, positions[failure].tolist(), movements[failure].tolist(),
+                           expected.tolist(), shard, done + failure)
+
+    def shrink_candidates(self, position, movement):
+        # simpler versions of a trial: each coordinate on its own moved toward 0, all of them halved at once,
+        # and the start moved toward 0 with the movement changed so the trial still ends at the same place
+        trial = np.concatenate([position, movement])
+        free = np.setdiff1d(np.flatnonzero(trial), self.fixed_columns)
+        x = trial[free]
+        halved = (x / 2).astype(trial.dtype) # rounded toward 0 for integers
+        if np.issubdtype(trial.dtype, np.integer):
+            values = np.stack([np.zeros_like(x), halved, x - np.sign(x)])
+        else:
+            halved = np.round(halved, 2) # or shrinking floats never ends
+            values = np.stack([np.zeros_like(x), halved, np.trunc(x), np.round(x, 2)])
+        candidates = np.repeat(trial[None], values.size + 1, axis=0)
+        candidates[np.arange(values.size), np.tile(free, len(values))] = values.ravel()
+        candidates[-1, free] = halved
+        shared = min(len(movement), len(position))
+        moved = candidates[:, :shared] - position[:shared]
+        same_end = candidates[np.any(moved != 0, axis=1)].copy()
+        same_end[:, len(position):len(position) + shared] -= moved[np.any(moved != 0, axis=1)]
+        candidates = np.concatenate([candidates, same_end])
+        smaller = np.abs(candidates).sum(axis=1) < np.abs(trial).sum()
+        return candidates[smaller, :len(position)], candidates[smaller, len(position):]
+
+    def shrink(self, model, result, budget: float = 0.25):
+        """ Looks for a smaller trial the model still gets wrong, starting at the failing trial of `result`.
+        Every round runs the model on all candidates from shrink_candidates at once and keeps the smallest
+        wrong one, until none is wrong or `budget` seconds are used up. The trial ends up in result.shrunk. """
+        position, movement = np.asarray(result.position), np.asarray(result.movement)
+        start = time.perf_counter()
+        while time.perf_counter() - start < budget:
+            positions, movements = self.shrink_candidates(position, movement)
+            if not len(positions):
+                break
+            try:
+                wrong = self._wrong(model, positions, movements)
+            except Exception: # the model breaks on some candidate, which is a different bug than the one we shrink
+                break
+            if not wrong.any():
+                break
+            sizes = np.abs(positions).sum(axis=1) + np.abs(movements).sum(axis=1)
+            best = np.flatnonzero(wrong)[np.argmin(sizes[wrong])]
+            position, movement = positions[best], movements[best]
+
+        predicted = None
+        vectorized = getattr(model, "vectorized", False)
+        try:
+            if vectorized:
+                predicted = model(position[None].copy(), movement[None].copy())
+            else:
+                predicted = model(self._model_input(position), self._model_input(movement))
+        except Exception as e:
+            predicted = f"nothing, it raises {type(e).__name__}: {e}"
+        else:
+            predicted = self._shown(predicted[0] if vectorized and np.ndim(predicted) == 2 else predicted)
+        result.shrunk = {"position": position.tolist(), "movement": movement.tolist(),
+                         "expected": self.move_batch(position[None], movement[None])[0].tolist(), "predicted": predicted}
+        return result
+
+    def check_iter(self, model, trials: int = None, seed: int = None, shrink: bool = False, batch: int = None,
+                   keep_going: bool = False, stop=None):
+        """ check, one batch of trials at a time: yields a CheckProgress after every batch, the last one
+        carries the result. Stop iterating (or set the `stop` Event) to cancel the check. With `keep_going`
+        the check runs all trials even after a failure, so the rate covers all of them. """
+        start = time.perf_counter()
+        trials = trials or self.trials
+        for done, wrong, result in self._check_batches(model, trials, np.random.default_rng(seed), stop,
+                                                       batch=batch, keep_going=keep_going):
+            if result is not None and shrink and not result:
+                self.shrink(model, result)
+            yield CheckProgress(done, trials, wrong, time.perf_counter() - start, result)
+
+    def check(self, model, trials: int = None, seed: int = None, workers: int = 1, shrink: bool = False): # model is a function that given the context (i.e. the position and where to move) and predicts how a state (i.e. the position) changes
+        if workers != 1:
+            result = check_parallel(self, model, trials, seed, workers)
+            if shrink and not result:
+                self.shrink(model, result)
+            return result
+        for progress in self.check_iter(model, trials, seed, shrink):
+            pass
+        return progress.result
+
 class Euclidean(Level):
     def __init__(self, dim: int = 3):
         self.dim = dim
         self.dim_move = dim
-        self.position = np.zeros(dim)
+        self.position = np.zeros(dim, dtype=self.dtype)
+        self.known_points = PointStore(dim, dtype=self.dtype)
     
     def description(self):
         return """This level takes dim (usually 3) values as a movementvector and
@@ -64,10 +765,20 @@ class Euclidean(Level):
         so model should have type model(position: List(int), movement: List(int)) -> List(int) where every list is dim long"""
     
     def move(self, movement_vector: np.ndarray):
-        self.position += movement_vector
+        self.position += self._typed(movement_vector)
+
+    def _walk(self, steps: np.ndarray) -> np.ndarray:
+        # the positions after every step, summed in the same order as repeated `+=`
+        path = np.add.accumulate(np.vstack([self.position, steps]), axis=0)[1:]
+        if len(path):
+            self.position[:] = path[-1]
+        return path
+
+    def move_path(self, movements: np.ndarray) -> np.ndarray:
+        return self._walk(self._typed(movements).reshape(-1, self.dim_move))
     
     def save_point(self, name: str):
-        self.known_points[name] = self.position.copy()
+        self.known_points[name] = self.position
 
     def measure_angle(self, left_point: str, right_point: str) -> int: # measuring the angle (in rad) between two points and the current position
         a = self.known_points[left_point] - self.position
@@ -77,20 +788,159 @@ class Euclidean(Level):
     def measure_length(self, other_point) -> int:
         return self.known_points[other_point]-self.position
 
-    def check(self, model):
-        for i in range(100):
-            pos = np.random.randint(-1000, 1000, self.dim)
-            move = np.random.randint(-1000, 1000, self.dim)
-            if nparr_to_list(pos+move) != model(nparr_to_list(pos), nparr_to_list(move)):
-                return False
-        return True
+    def measure_lengths(self) -> np.ndarray: # measure_length for every saved point at once, row i belongs to known_points.names[i]
+        return self._lengths(self.known_points.array, self.position)
+
+    def measure_angles(self) -> np.ndarray: # measure_angle for every pair of saved points at once, as a symmetric matrix
+        return _pairwise_angles(self.measure_lengths())
+
+    def _embed(self, positions):
+        return np.asarray(positions, dtype=float)
+
+    def _lengths(self, points, current):
+        return points - current[..., None, :]
+
+    def _box(self, low, high):
+        # sampler for positions and movements anywhere in [low, high)
+        return lambda n, rng: (rng.integers(low, high, (n, self.dim)), rng.integers(low, high, (n, self.dim_move)))
+
+    def regions(self):
+        def standing_still(n, rng):
+            return rng.integers(-1000, 1000, (n, self.dim)), np.zeros((n, self.dim_move), dtype=np.int64)
+        return [("far", 0.6, self._box(-1000, 1000)), ("close by", 0.3, self._box(-10, 10)), ("standing still", 0.1, standing_still)]
+
+    def move_batch(self, positions, movements):
+        return positions + movements
+
+    exhaustive_boxes = ((-5, 5), (-5, 5)) # default (low, high) of positions and of movements for check_exhaustive
+
+    def check_exhaustive(self, model, position_box=None, movement_box=None, chunk: int = 2**16) -> CheckResult:
+        """ Checks the model on every combination of position and movement with integer coordinates
+        inside the boxes instead of on random trials. A box is a (low, high) pair for all axes or one
+        such pair per axis, both bounds included. The cases are generated and checked `chunk` at a
+        time, so memory stays bounded however big the boxes are. """
+        boxes = []
+        for box, default, dim in ((position_box, self.exhaustive_boxes[0], self.dim), (movement_box, self.exhaustive_boxes[1], self.dim_move)):
+            box = np.array(default if box is None else box)
+            boxes.append(np.broadcast_to(box, (dim, 2)))
+        low = np.concatenate([box[:, 0] for box in boxes])
+        shape = tuple(np.concatenate([box[:, 1] - box[:, 0] + 1 for box in boxes]))
+        total = int(np.prod(shape))
+
+        for start in range(0, total, chunk):
+            cases = np.stack(np.unravel_index(np.arange(start, min(start + chunk, total)), shape), axis=1) + low
+            positions, movements = cases[:, :self.dim], cases[:, self.dim:]
+            failure, error = self._first_failure(model, positions, movements)
+            if failure is not None:
+                result = self._failed(positions, movements, failure, start)
+                result.error = error
+                return result
+        return CheckResult(True, total)
+
+
+class Wormholes(Euclidean):
+    """ A plane world, positions are (x, y, z) and movements (dx, dy), with portals: arriving on
+    one end of a portal puts you on its other end. The ends are kept in a CellIndex, so finding
+    the portal under a position takes the same time however many portals there are, for a
+    single move as well as for a whole batch. """
+    def __init__(self, portals=()):
+        super().__init__()
+        self.dim_move = 2
+        self.portals = CellIndex(3) # both ends of every portal
+        self._exits = np.empty((0, 3), dtype=self.dtype) # where you end up from the portal end in the same row of self.portals
+        self.add_portals(portals)
+
+    def add_portals(self, portals): # (K, 2, 3) array of the two ends of K portals, both ends lead to the other one
+        portals = self._typed(portals).reshape(-1, 2, 3)
+        ends = portals.reshape(-1, 3)
+        if len(np.unique(ends, axis=0)) < len(ends) or self.portals.contains(ends).any():
+            raise ValueError("a cell can only be the end of one portal")
+        self.portals.update(ends)
+        self._exits = np.concatenate([self._exits, portals[:, ::-1].reshape(-1, 3)])
+
+    def _cache_settings(self):
+        return dict(super()._cache_settings(), portals=self.portals.array.tolist())
+
+    def _teleport(self, positions): # every (N, 3) position on a portal end moved to the portal's other end, in place
+        rows = self.portals.rows(positions)
+        through = rows >= 0
+        positions[through] = self._exits[rows[through]]
+        return positions
 
+    def move(self, movement_vector: np.ndarray):
+        self.position += np.append(self._typed(movement_vector), 0)
+        row = self.portals.row(self.position)
+        if row >= 0:
+            self.position[:] = self._exits[row]
+
+    def move_path(self, movements: np.ndarray) -> np.ndarray:
+        movements = self._typed(movements).reshape(-1, 2)
+        steps = np.column_stack([movements, np.zeros(len(movements), dtype=self.dtype)])
+        path = np.empty((len(steps), 3), dtype=self.dtype)
+        # walks windows that grow while no portal is hit, a portal moves the rest of the path
+        start, window = 0, 64
+        while start < len(steps):
+            stop = min(start + window, len(steps))
+            run = self._walk(steps[start:stop])
+            rows = self.portals.rows(run)
+            hits = np.flatnonzero(rows >= 0)
+            if not len(hits):
+                path[start:stop] = run
+                start, window = stop, 2 * window
+                continue
+            hit = start + hits[0]
+            path[start:hit] = run[:hits[0]]
+            path[hit] = self._exits[rows[hits[0]]]
+            self.position[:] = path[hit]
+            start, window = hit + 1, 64
+        return path
+
+    def regions(self):
+        # uniform trials would (almost) never come near a portal, so most regions are about them
+        ends = self.portals.array
+        if not len(ends):
+            return super().regions()
+        around = np.array([(x, y) for x in (-1, 0, 1) for y in (-1, 0, 1) if x or y])
+
+        def on_a_plane(positions, rng):
+            # only the planes with portals in them are interesting
+            positions[:, 2] = ends[rng.integers(0, len(ends), len(positions)), 2]
+            return positions
+        def box(low, high):
+            return lambda n, rng: (on_a_plane(rng.integers(low, high, (n, 3)), rng), rng.integers(low, high, (n, 2)))
+        def arriving(offsets):
+            # from anywhere on its plane to a portal end (moved by one of the offsets)
+            def sampler(n, rng):
+                targets = ends[rng.integers(0, len(ends), n)]
+                positions = rng.integers(-1000, 1000, (n, 3))
+                positions[:, 2] = targets[:, 2]
+                return positions, targets[:, :2] + offsets[rng.integers(0, len(offsets), n)] - positions[:, :2]
+            return sampler
+        def leaving(movements):
+            # from a portal end by one of the movements
+            def sampler(n, rng):
+                return ends[rng.integers(0, len(ends), n)], movements(n, rng)
+            return sampler
+
+        return [
+            ("onto a portal", 0.25, arriving(np.zeros((1, 2), dtype=self.dtype))),
+            ("next to a portal", 0.1, arriving(around)),
+            ("off a portal", 0.1, leaving(lambda n, rng: rng.integers(-10, 10, (n, 2)))),
+            ("standing still on a portal", 0.05, leaving(lambda n, rng: np.zeros((n, 2), dtype=self.dtype))),
+            ("far", 0.3, box(-1000, 1000)),
+            ("close by", 0.2, box(-10, 10)),
+        ]
+
+    def move_batch(self, positions, movements):
+        return self._teleport(positions + np.column_stack([movements, np.zeros(len(movements), dtype=movements.dtype)]))
+
+
+class Elevator(Wormholes):
+    exhaustive_boxes = (((-10, 10), (-10, 10), (0, 1)), (-10, 10)) # both planes, standing still on the wormhole included
 
-class Elevator(Euclidean):
     def __init__(self):
-        super().__init__()
-        self.dim_move = 2
-        self.known_points["check me out"] = np.array([1,2,0])
+        super().__init__([[[1,2,0], [1,2,1]]])
+        self.known_points["check me out"] = [1,2,0]
 
     def description(self):
         return """In this level, positions are represented by 3-dimensional lists, while the movement vector by a 2-dimensional list. Given the current position and a movement vector, you need to predict the next position.
@@ -115,61 +965,11 @@ You could think of `[1, 2, 0]` as a [wormhole](https://en.wikipedia.org/wiki/Wor
 It has been pointed out that maths is [unreasonably effective](https://en.wikipedia.org/wiki/The_Unreasonable_Effectiveness_of_Mathematics_in_the_Natural_Sciences) at modelling the natural word. And indeed, when we try to model simple physics experiments, we often reach mathematical descriptions that apply to a large class of phenomena. Is there underlying truth to these models? Should we expect that mathematical possibilities in our models will translate to (yet-unobserved) physical phenomena?
 
 Or should we always be careful not to mistake the map for the mountain? That is, (mathematical) models are useful as "maps" in as much as they predict how the world functions (i.e. show us the way through the mountains). But we should put little trust in maps of uncharted territories. Even if an elegant mathematical theory predicts some theoretical outcomes, should we only trust in it once we observe it empirically?"""
-    
-    def move(self, movement_vector: np.ndarray):
-        self.position += np.append(movement_vector, 0)
-        if np.all(self.position == self.known_points["check me out"]):
-            self.position += np.array([0,0,1])
-        elif list(self.position) == list(self.known_points["check me out"]+np.array([0,0,1])):
-            self.position -= np.array([0,0,1])
-
-    def check(self, model):
-        save_position = self.position
-
-        for i in range(100):
-            pos = np.random.randint(-1000, 1000, 3)
-            pos[2] = np.random.randint(0,2)
-            self.position = pos.copy()
-            move = np.random.randint(-1000, 1000, 2)
-            self.move(move)
-            if nparr_to_list(self.position) != model(nparr_to_list(pos), nparr_to_list(move)):
-                self.position = save_position
-                return False
-    
-        for i in range(100):
-            pos = np.random.randint(-10, 10, 3)
-            pos[2] = np.random.randint(0,2)
-            self.position = pos.copy()
-            move = np.random.randint(-10, 10, 2)
-            self.move(move)
-            if nparr_to_list(self.position) != model(nparr_to_list(pos), nparr_to_list(move)):
-                self.position = save_position
-                return False
-    
-        pos = [30, 20, 1]
-        self.position = pos.copy()
-        move = [-29, -18]
-        self.move(move)
-        if nparr_to_list(self.position) != model(nparr_to_list(pos), nparr_to_list(move)):
-            self.position = save_position
-            return False
-    
-        pos = [30, 20, 0]
-        self.position = pos.copy()
-        move = [-29, -18]
-        self.move(move)
-        if nparr_to_list(self.position) != model(nparr_to_list(pos), nparr_to_list(move)):
-            self.position = save_position
-            return False
-    
-        # TODO can not test position at "check me out" and move 0 as this is not testable for user
-        # TODO wrong, they can stand still on that spot, but maybe hard to guess
-
-        self.position = save_position
-        return True
       
 
 class SimpleTime(Euclidean):
+    exhaustive_boxes = ((-10, 10), (-10, 10))
+
     def __init__(self):
         super().__init__()
         self.dim_move = 2
@@ -182,30 +982,44 @@ class SimpleTime(Euclidean):
         so model should have type model(position: List(int), movement: List(int)) -> List(int)"""
     
     def move(self, movement_vector: np.ndarray):
+        movement_vector = self._typed(movement_vector)
         self.position += np.append(movement_vector, round(np.sqrt(movement_vector[0]**2+movement_vector[1]**2)))
-    
-    def check(self, model):
-        save_position = self.position
 
-        for i in range(100):
-            pos = np.random.randint(-1000, 1000, 3)
-            self.position = pos.copy()
-            move = np.random.randint(-1000, 1000, 2)
-            self.move(move)
-            if nparr_to_list(self.position) != model(nparr_to_list(pos), nparr_to_list(move)):
-                self.position = save_position
-                return False
-        
-        for i in range(30):
-            pos = np.random.randint(-10, 10, 3)
-            self.position = pos.copy()
-            move = np.random.randint(-10, 10, 2)
-            self.move(move)
-            if nparr_to_list(self.position) != model(nparr_to_list(pos), nparr_to_list(move)):
-                self.position = save_position
-                return False
-        self.position = save_position
-        return True
+    def _time(self, movements): # how much time every (N, 2) movement takes, the rounded length
+        return np.rint(np.sqrt(movements[:, 0]**2 + movements[:, 1]**2)).astype(self.dtype)
+
+    def move_path(self, movements: np.ndarray) -> np.ndarray:
+        movements = self._typed(movements).reshape(-1, 2)
+        return self._walk(np.column_stack([movements, self._time(movements)]))
+    
+    def regions(self):
+        def rounding_boundary(n, rng):
+            # movements whose length lies just below or just above some k + 1/2;
+            # dy stays small next to dx, so rounding it barely moves the length
+            dx = rng.integers(100, 1000, n)
+            length = np.floor(dx * rng.uniform(1, 1.03, n)) + 0.5
+            dy = np.rint(np.sqrt(length**2 - dx**2)).astype(np.int64)
+            movements = np.column_stack([dx, dy]) * rng.choice([-1, 1], (n, 2))
+            swap = rng.integers(0, 2, n) == 1
+            movements[swap] = movements[swap, ::-1]
+            return rng.integers(-1000, 1000, (n, 3)), movements
+        def along_an_axis(n, rng):
+            # lengths without any rounding
+            movements = np.zeros((n, 2), dtype=np.int64)
+            movements[np.arange(n), rng.integers(0, 2, n)] = rng.integers(-1000, 1000, n)
+            return rng.integers(-1000, 1000, (n, 3)), movements
+        def standing_still(n, rng):
+            return rng.integers(-1000, 1000, (n, 3)), np.zeros((n, 2), dtype=np.int64)
+        return [
+            ("rounding boundary", 0.3, rounding_boundary),
+            ("along an axis", 0.1, along_an_axis),
+            ("standing still", 0.05, standing_still),
+            ("far", 0.35, self._box(-1000, 1000)),
+            ("close by", 0.2, self._box(-10, 10)),
+        ]
+
+    def move_batch(self, positions, movements):
+        return positions + np.column_stack([movements, self._time(movements)])
 
 
 # As you can see: AI generated
@@ -216,7 +1030,8 @@ class Spherical(Level):
     works with 3‑dimensional spherical coordinates (θ, φ, r) internally, but the
     description does **not** reveal the geometry.
     """
-    position = [0.0,0.0]
+    fixed_columns = (2,) # the radius
+    dtype = np.float64
 
     # ------------------------------------------------------------------ #
     # Construction – fixed to a 3‑D sphere (dim = 3)
@@ -225,37 +1040,59 @@ class Spherical(Level):
         if radius <= 0:
             raise ValueError("radius must be > 0")
         self.r = float(radius)
+        self.dim = 2                           # the position is (θ, φ)
+        self.dim_move = 2
 
         # start at (θ=0, φ=π/2) → point on the equator, x = r
-        self.position[0] = 0.0                 # azimuth  ∈ [0, 2π)
-        self.position[1] = np.pi / 2.0         # polar    ∈ [0, π]
+        self.position = np.array([0.0,         # azimuth  ∈ [0, 2π)
+                                  np.pi / 2])  # polar    ∈ [0, π]
 
-        self.known_points = {}
+        self.known_points = PointStore(2)      # saved (θ, φ)
+        self._units = PointStore(3)            # unit vectors of the saved points, same order
+        self._current = None                   # (θ, φ, unit vector) of the last position we converted
 
     # ------------------------------------------------------------------ #
     # Helpers – conversion between spherical and Cartesian
     # ------------------------------------------------------------------ #
-    def _cartesian(self, theta: float, phi: float) -> np.ndarray:
-        """Cartesian coordinates of the current radius‑r point."""
-        return self.r * np.array([
+    @staticmethod
+    def _unit(theta, phi) -> np.ndarray:
+        """Unit vector towards (θ, φ) (or one per row for arrays of angles)."""
+        return np.stack([
             np.sin(phi) * np.cos(theta),
             np.sin(phi) * np.sin(theta),
             np.cos(phi)
-        ])
-
-    def _normalize_angles(self):
-        """Wrap θ to [0,2π) and keep φ inside [0,π] (reflect at the poles)."""
-        self.position[0] = self.position[0] % (2 * np.pi)
-
-        # reflect φ when it leaves the [0,π] interval
-        while self.position[1] < 0 or self.position[1] > np.pi:
-            if self.position[1] < 0:
-                self.position[1] = -self.position[1]
-                self.position[0] += np.pi          # crossing the south pole flips azimuth
-            elif self.position[1] > np.pi:
-                self.position[1] = 2 * np.pi - self.position[1]
-                self.position[0] += np.pi          # crossing the north pole flips azimuth
-        self._normalize_angles() if (self.position[1] < 0 or self.position[1] > np.pi) else None
+        ], axis=-1)
+
+    def _current_unit(self) -> np.ndarray:
+        """
+        Unit vector of the current position.  `move` keeps it up to date, it
+        is only recomputed when the position was changed some other way.
+        """
+        theta, phi = self.position
+        if self._current is None or self._current[:2] != (theta, phi):
+            self._current = (theta, phi, self._unit(theta, phi))
+        return self._current[2]
+
+    @staticmethod
+    def _reflect_phi(phi):
+        """
+        Reflects φ at the poles into [0,π] and counts the reflections, in
+        closed form for scalars or whole arrays: φ folds with period 2π,
+        and it takes ⌈φ/π⌉ − 1 reflections (⌈−φ/π⌉ below 0) to get there.
+        """
+        crossings = np.where(phi < 0, np.ceil(-phi / np.pi), np.maximum(np.ceil(phi / np.pi) - 1, 0))
+        folded = np.mod(phi, 2 * np.pi)
+        return np.where(folded > np.pi, 2 * np.pi - folded, folded), crossings
+
+    @classmethod
+    def _normalize(cls, theta, phi):
+        """
+        Wrap θ to [0,2π) and keep φ inside [0,π] (reflect at the poles), for
+        scalars or whole arrays.  Every pole crossing turns the azimuth by π.
+        `move` and `move_batch` go through here, `move_path` takes the same steps.
+        """
+        phi, crossings = cls._reflect_phi(phi)
+        return np.mod(theta + np.pi * (crossings % 2), 2 * np.pi), phi
 
     # ------------------------------------------------------------------ #
     # Public API required by the framework
@@ -274,13 +1111,66 @@ vector, updates the position, and lets you save/measure points."""
             raise ValueError("movement vector must have shape (2,) for a 3‑D sphere")
 
         dtheta, dphi = movement_coords
-        self.position[0] += dtheta
-        self.position[1]   += dphi
-        self._normalize_angles()
+        theta, phi = self._normalize(self.position[0] + dtheta, self.position[1] + dphi)
+        self.position[0], self.position[1] = theta, phi
+        self._current = (self.position[0], self.position[1], self._unit(theta, phi))
+
+    def move_path(self, movements: np.ndarray) -> np.ndarray:
+        """
+        Applies the (K, 2) movements one after the other and returns all K
+        visited [θ, φ], the same values repeated `move` calls give.  Both
+        angles are summed up in one go as long as nothing wraps around and
+        only the steps that cross a pole or θ = 0 are done one by one.
+        """
+        movements = np.asarray(movements, dtype=float).reshape(-1, 2)
+        k = len(movements)
+        phi, flips = np.empty(k), np.zeros(k)
+
+        # sums over windows that grow while no pole is crossed, so walks that
+        # cross often do not sum up the whole rest of the path again every time
+        start, current, window = 0, self.position[1], 64
+        while start < k:
+            stop = min(start + window, k)
+            run = np.add.accumulate(np.concatenate([[current], movements[start:stop, 1]]))[1:]
+            outside = (run < 0) | (run > np.pi)
+            if not outside.any():
+                phi[start:stop] = run
+                start, current, window = stop, run[-1], 2 * window
+                continue
+            cross = start + int(np.argmax(outside))
+            phi[start:cross] = run[:cross - start]
+            # this step crosses a pole: reflect it and continue from there
+            phi[cross], flips[cross] = self._reflect_phi(run[cross - start])
+            start, current, window = cross + 1, phi[cross], 64
+
+        # θ the same way: summed up while it stays inside [0,2π), where wrapping it changes nothing,
+        # and every step that leaves that range or crosses a pole (which turns the azimuth by π)
+        # is done on its own, exactly like `move` does it
+        theta = np.empty(k)
+        start, current, window = 0, self.position[0], 64
+        while start < k:
+            stop = min(start + window, k)
+            run = np.add.accumulate(np.concatenate([[current], movements[start:stop, 0]]))[1:]
+            special = (run < 0) | (run >= 2 * np.pi) | (flips[start:stop] != 0)
+            if not special.any():
+                theta[start:stop] = run
+                start, current, window = stop, run[-1], 2 * window
+                continue
+            step = start + int(np.argmax(special))
+            theta[start:step] = run[:step - start]
+            previous = theta[step - 1] if step else self.position[0]
+            theta[step] = np.mod(previous + movements[step, 0] + np.pi * (flips[step] % 2), 2 * np.pi)
+            start, current, window = step + 1, theta[step], 64
+
+        if k:
+            self.position[0], self.position[1] = theta[-1], phi[-1]
+            self._current = (theta[-1], phi[-1], self._unit(theta[-1], phi[-1]))
+        return np.column_stack([theta, phi])
 
     def save_point(self, name: str):
-        """Remember the current spherical coordinates under `name`."""
-        self.known_points[name] = (self.position[0], self.position[1])
+        """Remember the current spherical coordinates (and their unit vector) under `name`."""
+        self.known_points[name] = self.position
+        self._units[name] = self._current_unit()
 
     def measure_angle(self, left_point: str, right_point: str) -> float:
         """
@@ -288,10 +1178,10 @@ vector, updates the position, and lets you save/measure points."""
         the current position – i.e. the spherical angle at the current vertex of
         the triangle formed by the three points.
         """
-        # convert everything to Cartesian vectors that start at the centre
-        cur   = self._cartesian(self.position[0], self.position[1])
-        left  = self._cartesian(*self.known_points[left_point])
-        right = self._cartesian(*self.known_points[right_point])
+        # Cartesian vectors that start at the centre
+        cur   = self.r * self._current_unit()
+        left  = self.r * self._units[left_point]
+        right = self.r * self._units[right_point]
 
         # vectors from the current point to the two saved points
         a = left - cur
@@ -311,60 +1201,291 @@ vector, updates the position, and lets you save/measure points."""
         saved point:  r · Δσ, where Δσ is the central angle between the two radius
         vectors.
         """
-        cur  = self._cartesian(self.position[0], self.position[1])
-        oth  = self._cartesian(*self.known_points[other_point])
-        dot  = np.dot(cur, oth)
-        cos_sigma = np.clip(dot / (self.r ** 2), -1.0, 1.0)
+        cos_sigma = np.clip(np.dot(self._current_unit(), self._units[other_point]), -1.0, 1.0)
         sigma = np.arccos(cos_sigma)
         return self.r * sigma
 
-    def check(self, model):
+    def measure_lengths(self) -> np.ndarray:
         """
-        Randomly generate 100 positions (θ, φ) and movement vectors (Δθ, Δφ).
-        For each trial:
-          1. Build the position list   → [θ, φ, r]
-          2. Build the movement list   → [Δθ, Δφ]
-          3. Compute the expected new spherical coordinates
-             using the same logic as `move`.
-          4. Call the model and verify:
-                * it returns a list of length 3,
-                * the radius component equals `self.r` (within tolerance),
-                * the returned angles match the expected ones (tolerance 1e‑5).
-        """
-        for _ in range(100):
-            # ----- random position -----
-            theta = np.random.uniform(0, 2 * np.pi)
-            phi   = np.random.uniform(0, np.pi)
-            pos_list = [theta, phi, self.r]
-
-            # ----- random movement (Δθ, Δφ) -----
-            dtheta = np.random.uniform(-np.pi, np.pi)          # up to half‑circumference
-            dphi   = np.random.uniform(-np.pi / 2, np.pi / 2)   # avoid jumping over both poles at once
-            mov_list = [dtheta, dphi]
-
-            # ----- expected new state -----
-            # copy current angles so the level isn’t polluted for the next loop
-            self.position[0], self.position[1] = theta, phi
-            self.move(np.array([dtheta, dphi]))
-            expected = [self.position[0], self.position[1], self.r]
-
-            # ----- model output -----
-            try:
-                out = model(pos_list, mov_list)
-            except Exception:
-                return False
+        `measure_length` for every saved point at once; entry i belongs to
+        `known_points.names[i]`.
+        """
+        return self._lengths(self._units.array, self._current_unit())
 
-            # ----- validation -----
-            if not isinstance(out, (list, tuple)) or len(out) != 3:
-                return False
-            out_theta, out_phi, out_r = out
-            if not np.isclose(out_r, self.r, atol=1e-5):
-                return False
-            if not np.isclose(out_theta % (2*np.pi), expected[0] % (2*np.pi), atol=1e-5):
-                return False
-            if not np.isclose(out_phi, expected[1], atol=1e-5):
-                return False
-        return True
+    def measure_angles(self) -> np.ndarray:
+        """
+        `measure_angle` for every pair of saved points at once, as a symmetric
+        matrix.  Pairs with a point on the current position are NaN instead of
+        raising.
+        """
+        # the radius does not change any angle
+        return _pairwise_angles(self._units.array - self._current_unit())
+
+    def _embed(self, positions):
+        positions = np.asarray(positions, dtype=float)
+        return self._unit(positions[..., 0], positions[..., 1])
+
+    def _lengths(self, points, current):
+        cos_sigma = np.clip(np.sum(points * current[..., None, :], axis=-1), -1.0, 1.0)
+        return self.r * np.arccos(cos_sigma)
+
+    # ------------------------------------------------------------------ #
+    # Checking – trials are generated and evaluated as whole arrays
+    # ------------------------------------------------------------------ #
+    def regions(self):
+        """
+        Random positions [θ, φ, r] and movements [Δθ, Δφ]:
+          * Δθ reaches up to half the circumference,
+          * |Δφ| ≤ π/2 so a single move never jumps over both poles at once,
+        with extra weight on the places where the coordinates wrap around:
+        crossing either pole and crossing θ = 0.
+        """
+        def trial(theta, phi, dtheta, dphi):
+            n = len(theta)
+            return np.column_stack([theta, phi, np.full(n, self.r)]), np.column_stack([dtheta, dphi])
+        def anywhere(n, rng):
+            return trial(rng.uniform(0, 2 * np.pi, n), rng.uniform(0, np.pi, n),
+                         rng.uniform(-np.pi, np.pi, n), rng.uniform(-np.pi / 2, np.pi / 2, n))
+        def over_the_north_pole(n, rng):
+            phi = rng.uniform(0, 0.1, n)
+            return trial(rng.uniform(0, 2 * np.pi, n), phi, rng.uniform(-np.pi, np.pi, n), -rng.uniform(phi, np.pi / 2))
+        def over_the_south_pole(n, rng):
+            phi = rng.uniform(np.pi - 0.1, np.pi, n)
+            return trial(rng.uniform(0, 2 * np.pi, n), phi, rng.uniform(-np.pi, np.pi, n), rng.uniform(np.pi - phi, np.pi / 2))
+        def over_theta_zero(n, rng):
+            up = rng.integers(0, 2, n) == 1
+            theta = np.where(up, rng.uniform(2 * np.pi - 0.1, 2 * np.pi, n), rng.uniform(0, 0.1, n))
+            dtheta = np.where(up, 1, -1) * rng.uniform(0.1, np.pi, n)
+            return trial(theta, rng.uniform(0, np.pi, n), dtheta, rng.uniform(-np.pi / 2, np.pi / 2, n))
+        def standing_still(n, rng):
+            return trial(rng.uniform(0, 2 * np.pi, n), rng.uniform(0, np.pi, n), np.zeros(n), np.zeros(n))
+        return [
+            ("anywhere", 0.45, anywhere),
+            ("over the north pole", 0.15, over_the_north_pole),
+            ("over the south pole", 0.15, over_the_south_pole),
+            ("over θ = 0", 0.15, over_theta_zero),
+            ("standing still", 0.1, standing_still),
+        ]
+
+    def move_many(self, positions, movements):
+        """`move` for many [θ, φ] positions at once."""
+        theta, phi = self._normalize(positions[:, 0] + movements[:, 0], positions[:, 1] + movements[:, 1])
+        return np.column_stack([theta, phi])
+
+    def move_batch(self, positions, movements):
+        """Expected new [θ, φ, r] for every trial, using the same logic as `move`."""
+        return np.column_stack([self.move_many(positions, movements), np.full(len(positions), self.r)])
+
+    def compare_batch(self, expected, predicted):
+        """
+        A prediction is right when the radius equals `self.r` and both angles
+        match the expected ones (θ modulo 2π, so 2π − ε and ε are 2ε apart),
+        all within a tolerance of 1e‑5.
+        """
+        dtheta = (predicted[:, 0] - expected[:, 0] + np.pi) % (2*np.pi) - np.pi
+        return (np.isclose(predicted[:, 2], self.r, atol=1e-5)
+                & np.isclose(dtheta, 0, atol=1e-5)
+                & np.isclose(predicted[:, 1], expected[:, 1], atol=1e-5))
+
+
+class Hyperbolic(Level):
+    """
+    A level where the player moves on a saddle‑shaped plane of constant
+    negative curvature.  Positions are points (t, x, y) on the hyperboloid
+    t² − x² − y² = 1, t > 0, and a move is a geodesic step in the frame the
+    player carries along straight lines from the origin.  As for `Spherical`,
+    the description does **not** reveal the geometry.
+    """
+    dtype = np.float64
+
+    # ------------------------------------------------------------------ #
+    # Construction – the hyperbolic plane, embedded in 3‑D (t, x, y)
+    # ------------------------------------------------------------------ #
+    def __init__(self):
+        self.dim = 3                           # the position is (t, x, y)
+        self.dim_move = 2
+
+        # start at the origin of the hyperboloid
+        self.position = np.array([1.0, 0.0, 0.0])
+        self.known_points = PointStore(3)      # saved (t, x, y)
+
+    # ------------------------------------------------------------------ #
+    # Helpers – polar coordinates around the origin
+    #
+    # Far from the origin t, x and y grow like e^d, and the textbook
+    # formulas (Lorentz boosts, arccosh of the Minkowski product) subtract
+    # numbers of that size from each other and keep nothing of the answer.
+    # Everything below works with the distance d from the origin and the
+    # direction α instead, and only ever adds up terms of the same sign.
+    # ------------------------------------------------------------------ #
+    @staticmethod
+    def _polar(points):
+        """Distance from the origin and direction of (…, 3) hyperboloid points."""
+        points = np.asarray(points, dtype=float)
+        return np.arcsinh(np.hypot(points[..., 1], points[..., 2])), np.arctan2(points[..., 2], points[..., 1])
+
+    @staticmethod
+    def _point(distance, direction) -> np.ndarray:
+        """The hyperboloid point at `distance` from the origin towards `direction`."""
+        return np.stack([
+            np.cosh(distance),
+            np.sinh(distance) * np.cos(direction),
+            np.sinh(distance) * np.sin(direction)
+        ], axis=-1)
+
+    @classmethod
+    def _distance(cls, points, others):
+        """
+        Geodesic distance between (…, 3) points, from the law of cosines
+        written as sinh²(d/2) = sinh²((d₁−d₂)/2) + sinh d₁ sinh d₂ sin²(Δα/2),
+        which stays exact for close points far from the origin.
+        """
+        d1, a1 = cls._polar(points)
+        d2, a2 = cls._polar(others)
+        h = np.sinh((d1 - d2) / 2)**2 + np.sinh(d1) * np.sinh(d2) * np.sin((a1 - a2) / 2)**2
+        return 2 * np.arcsinh(np.sqrt(h))
+
+    @classmethod
+    def _heading(cls, points, others):
+        """
+        Direction (in the frame of `points`) in which `others` lie, NaN where
+        the two coincide.  γ is the angle at `points` between the way back to
+        the origin and the way to `others` (cotangent rule).
+        """
+        d1, a1 = cls._polar(points)
+        d2, a2 = cls._polar(others)
+        turn = a2 - a1
+        gamma = np.arctan2(np.sin(turn) * np.sinh(d2),
+                           np.sinh(d1 - d2) + 2 * np.cosh(d1) * np.sinh(d2) * np.sin(turn / 2)**2)
+        heading = a1 + np.pi - gamma
+        return np.where(cls._distance(points, others) > 0, heading, np.nan)
+
+    # ------------------------------------------------------------------ #
+    # Public API required by the framework
+    # ------------------------------------------------------------------ #
+    def description(self):
+        return """This level takes a 3‑dimensional position and a 2‑dimensional movement
+vector, updates the position, and lets you save/measure points."""
+
+    def move(self, movement_coords: np.ndarray):
+        """
+        `movement_coords` is a length‑2 array [u, v]: walk the length of it
+        along the geodesic that leaves the current point in its direction.
+        """
+        if movement_coords.shape != (2,):
+            raise ValueError("movement vector must have shape (2,) for the hyperbolic plane")
+        self.position = self.move_batch(self.position[None], np.asarray(movement_coords, dtype=float)[None])[0]
+
+    def save_point(self, name: str):
+        self.known_points[name] = self.position
+
+    def measure_angle(self, left_point: str, right_point: str) -> float:
+        """
+        Returns the angle (in radians) at the current position between the
+        geodesics to the two saved points.
+        """
+        points = np.stack([self.known_points[left_point], self.known_points[right_point]])
+        headings = self._heading(self.position, points)
+        if np.isnan(headings).any():
+            raise ValueError("saved point coincides with current position")
+        return float(np.abs((headings[1] - headings[0] + np.pi) % (2 * np.pi) - np.pi))
+
+    def measure_length(self, other_point: str) -> float:
+        """Returns the geodesic distance between the current position and a saved point."""
+        return float(self._distance(self.position, self.known_points[other_point]))
+
+    def measure_lengths(self) -> np.ndarray:
+        """`measure_length` for every saved point at once, in the order of `known_points.names`."""
+        return self._lengths(self.known_points.array, self.position)
+
+    def measure_angles(self) -> np.ndarray:
+        """
+        `measure_angle` for every pair of saved points at once, as a symmetric
+        matrix.  Pairs with a point on the current position are NaN instead of
+        raising.
+        """
+        return _pairwise_angles(self._directions(self.known_points.array, self.position))
+
+    def _embed(self, positions):
+        return np.asarray(positions, dtype=float)
+
+    def _lengths(self, points, current):
+        return self._distance(points, current[..., None, :])
+
+    def _directions(self, points, current):
+        # unit vectors towards the points in the frame at `current`, their angles are the ones at `current`
+        heading = self._heading(current[..., None, :], points)
+        return np.stack([np.cos(heading), np.sin(heading)], axis=-1)
+
+    # ------------------------------------------------------------------ #
+    # Checking – trials are generated and evaluated as whole arrays
+    # ------------------------------------------------------------------ #
+    def regions(self):
+        """
+        Random positions up to 15 from the origin (where t is about 10⁶) and
+        movements of up to 10, with extra weight on moves that pass close to
+        the origin again, where a Lorentz boost cancels out the most.
+        """
+        def trial(distance, direction, length, heading):
+            # `heading` is relative to the way out from the origin
+            move = length[:, None] * np.column_stack([np.cos(direction + heading), np.sin(direction + heading)])
+            return self._point(distance, direction), move
+        def near_the_origin(n, rng):
+            return trial(rng.uniform(0, 2, n), rng.uniform(-np.pi, np.pi, n), rng.uniform(0, 2, n), rng.uniform(-np.pi, np.pi, n))
+        def far_from_the_origin(n, rng):
+            return trial(rng.uniform(5, 15, n), rng.uniform(-np.pi, np.pi, n), rng.uniform(0, 3, n), rng.uniform(-np.pi, np.pi, n))
+        def long_moves(n, rng):
+            return trial(rng.uniform(0, 3, n), rng.uniform(-np.pi, np.pi, n), rng.uniform(3, 10, n), rng.uniform(-np.pi, np.pi, n))
+        def back_past_the_origin(n, rng):
+            distance = rng.uniform(1, 8, n) # further out, a boost in float64 is not within the tolerance
+            return trial(distance, rng.uniform(-np.pi, np.pi, n), distance * rng.uniform(0.9, 1.1, n), np.pi + rng.normal(0, 1e-3, n))
+        def standing_still(n, rng):
+            return trial(rng.uniform(0, 15, n), rng.uniform(-np.pi, np.pi, n), np.zeros(n), np.zeros(n))
+        return [
+            ("near the origin", 0.3, near_the_origin),
+            ("far from the origin", 0.25, far_from_the_origin),
+            ("long moves", 0.15, long_moves),
+            ("back past the origin", 0.2, back_past_the_origin),
+            ("standing still", 0.1, standing_still),
+        ]
+
+    def move_batch(self, positions, movements):
+        """
+        Expected new (t, x, y) for every trial.  The movement is split into
+        the part a along the way out from the origin and the part b across
+        it, and the hyperbolic law of cosines (and cotangent rule) give the
+        new distance and direction from the origin.
+        """
+        distance, direction = self._polar(positions)
+        movements = np.asarray(movements, dtype=float)
+        a = movements[:, 0] * np.cos(direction) + movements[:, 1] * np.sin(direction)
+        b = movements[:, 1] * np.cos(direction) - movements[:, 0] * np.sin(direction)
+        length = np.hypot(a, b)
+        moving = length > 0
+        safe = np.where(moving, length, 1)
+        # 1 + cos of the angle to the way out, without cancelling for moves straight back
+        backward = np.where(a < 0, safe - a, 1)
+        outward = np.where(moving, np.where(a >= 0, (length + a) / safe, b**2 / (safe * backward)), 0)
+        h = np.sinh((distance - length) / 2)**2 + np.sinh(distance) * np.sinh(length) * outward / 2
+        turn = np.arctan2(np.sinh(length) * b / safe,
+                          np.sinh(distance - length) + np.cosh(distance) * np.sinh(length) * outward)
+        return self._point(2 * np.arcsinh(np.sqrt(h)), direction + turn)
+
+    def compare_batch(self, expected, predicted):
+        """
+        A prediction is right when all three coordinates match the expected
+        ones within 1e‑6 of t (t grows like e^d and is the largest of them,
+        x and y can not be known any better than that far from the origin).
+        """
+        tolerance = 1e-6 * (1 + expected[:, :1])
+        return (np.abs(predicted - expected) <= tolerance).all(axis=1)
+
+    def shrink_candidates(self, position, movement):
+        # t follows from x and y, smaller trials have to stay on the hyperboloid
+        positions, movements = super().shrink_candidates(position, movement)
+        positions[:, 0] = np.sqrt(1 + positions[:, 1]**2 + positions[:, 2]**2)
+        smaller = np.abs(positions).sum(axis=1) + np.abs(movements).sum(axis=1) < np.abs(position).sum() + np.abs(movement).sum()
+        return positions[smaller], movements[smaller]
 
 
 import random
@@ -420,46 +1541,55 @@ class EverythingRandom(Level):
         return True
 
 class NObservation(Euclidean):
-    # roughly every second has something to observe
-    observations = [(random.randint(0,100), random.randint(0,100)) for i in range(5000)]
-
-    def __init__(self):
-        self.dim = 2
-        super().__init__()
+    def __init__(self, seed: int = None):
+        super().__init__(dim=2)
+        self.rng = np.random.default_rng(seed)
+        # roughly every second cell has something to observe, we already looked around [0, 100]^2
+        self.observations = ObservationField(int(self.rng.integers(2**63)), density=0.4)
+        self.observations.explore((0, 0), (100, 100))
 
     def observe(self):
         return self.position in self.observations
 
+    def observed(self, points) -> np.ndarray: # which of these (N, 2) points have something to observe
+        return self.observations.contains(points)
+
+    def _cache_settings(self): # the world and where the rng of check is
+        return dict(super()._cache_settings(), observations=self.observations.seed, rng=self.rng.bit_generator.state)
+
 
     def description(self):
         return """This level takes 2 dimensions as a movement and positionvector.
 
-        This level allows to observe stuff, we already looked around in the world for a bit and will give you those things using the objects list (a list with the position of the objects in 2d space)
+        This level allows to observe stuff, we already looked around in the world for a bit and will give you those things using objects (a set of the positions of the objects in 2d space, `position in objects` tells you whether there is one and `objects.array` gives you all of them)
         As a new thing please also return, whether there is something to be observed at the place where you are after the movement
 
-        so model should have type model(position: List(int), movement: List(int), objects: List(List(int))) -> (List(int), Bool)"""
+        so model should have type model(position: List(int), movement: List(int), objects: ObservationField) -> (List(int), Bool)"""
     
 
-    def check(self, model):
+    def check(self, model, trials: int = None, seed: int = None, workers: int = 1, shrink: bool = False):
         def model_curried(a, b):
             a,b = model(a,b, self.observations)
             return a
-        if not super.check(model_curried):
-            return False
+        result = super().check(model_curried, trials, seed, workers, shrink)
+        if not result:
+            return result
         
-        for i in range(100):
-            p = [random.randint(0, 150) for i in range(2)]
-            if (p in self.observations) != model(p, [0,0], self.observations):
+        rng = self.rng if seed is None else np.random.default_rng(seed)
+        points = rng.integers(0, 151, (100, 2))
+        for p, expected in zip(points.tolist(), self.observed(points)):
+            if expected != model(p, [0,0], self.observations)[1]:
                 return False
-        return True
+        return result
 
 
 class Observation(NObservation):
-    observations = []
+    def __init__(self, seed: int = None):
+        super().__init__(seed)
+        self.observations = CellIndex(2)
 
-    def __init__(self):
-        self.dim = 2
-        super().__init__()
+    def _cache_settings(self):
+        return dict(Euclidean._cache_settings(self), observations=self.observations.array.tolist(), rng=self.rng.bit_generator.state)
         
     
     def description(self):
@@ -470,32 +1600,90 @@ class Observation(NObservation):
 
         Differently to the previous level your model should take in a seed for python random number generator
 
-        so model should have type model(position: List(int), movement: List(int), objects: List(List(int)), magic: int) -> (List(int), Bool)"""
-        # TODO actually use random number generater objects instead of the global one, also for the previous level
+        so model should have type model(position: List(int), movement: List(int), objects: CellIndex, magic: int) -> (List(int), Bool)"""
     
     # TODO they need to reverse basically exact this function...
     def observe(self, magic=None):
         if magic is None:
-            magic = random.randint(0,3)
+            magic = self.rng.integers(0, 4)
         if magic == 0:
-            self.observations.append(self.position)
+            self.observations.add(self.position)
             return True
         else: return False
     
-    def check(self, model):
+    def check(self, model, trials: int = None, seed: int = None, workers: int = 1, shrink: bool = False):
         def model_curried(a, b):
-            a,b = model(a,b, self.observations, random.randint(0, 10))
+            a,b = model(a,b, self.observations, int(self.rng.integers(0, 11)))
             return a
-        if not super.check(model_curried):
-            return False
+        result = Euclidean.check(self, model_curried, trials, seed, workers, shrink)
+        if not result:
+            return result
         
 
         # TODO
         # Test no obervations there before
         # Test observations are persistent
 
-        for i in range(100):
-            p = [random.randint(0, 150) for i in range(2)]
-            if (p in self.observations) != model(p, [0,0], self.observations):
+        rng = self.rng if seed is None else np.random.default_rng(seed)
+        points = rng.integers(0, 151, (100, 2))
+        for p, expected in zip(points.tolist(), self.observed(points)):
+            if expected != model(p, [0,0], self.observations, int(self.rng.integers(0, 11)))[1]:
                 return False
-        return True
+        return result
+
+
+# ==============================================================
+
+class LevelBatch():
+    """ N independent instances of one level moving in lockstep, e.g. for automated explorers::
+
+            batch = LevelBatch(Elevator(), 10_000)
+            batch.move(rng.integers(-5, 5, (10_000, 2)))
+            batch.save_point("start")
+
+    The positions of all instances are one (N, dim) array and every step moves all of them with
+    one vectorized call of level.move_many, with the same results as N separate levels. Every
+    instance saves its own points, starting with the ones the level already knows. """
+    def __init__(self, level: Level, n: int):
+        self.level = level
+        self.positions = np.tile(level.position, (n, 1))
+        self.names = list(level.known_points.names)
+        # the saved points of every instance, embedded as level._embed does: (N, P, k)
+        self._points = np.repeat(level._embed(level.known_points.array)[None], n, axis=0)
+
+    def __len__(self):
+        return len(self.positions)
+
+    def move(self, movements: np.ndarray): # moves instance i by movements[i]
+        movements = self.level._typed(movements)
+        if movements.shape != (len(self), self.level.dim_move):
+            raise ValueError(f"expected movements of shape {(len(self), self.level.dim_move)}, got {movements.shape}")
+        self.positions = self.level.move_many(self.positions, movements)
+
+    def save_point(self, name: str): # every instance saves its own current position under `name`
+        embedded = self.level._embed(self.positions)
+        if name in self.names:
+            self._points[:, self.names.index(name)] = embedded
+        else:
+            self.names.append(name)
+            self._points = np.concatenate([self._points, embedded[:, None]], axis=1)
+
+    def _vectors(self):
+        # from the current position to every saved point, in the embedding: (N, P, k)
+        return self.level._directions(self._points, self.level._embed(self.positions))
+
+    def measure_lengths(self) -> np.ndarray: # measure_length of every saved point for every instance, [i, j] belongs to instance i and names[j]
+        return self.level._lengths(self._points, self.level._embed(self.positions))
+
+    def measure_length(self, other_point: str) -> np.ndarray:
+        return self.measure_lengths()[:, self.names.index(other_point)]
+
+    def measure_angles(self) -> np.ndarray: # measure_angles for every instance, as (N, P, P)
+        return _pairwise_angles(self._vectors())
+
+    def measure_angle(self, left_point: str, right_point: str) -> np.ndarray: # NaN where a point lies on the current position
+        vectors = self._vectors()[:, [self.names.index(left_point), self.names.index(right_point)]]
+        return _pairwise_angles(vectors)[:, 0, 1]
+
+    def observe(self) -> np.ndarray: # `observe` of every instance, for levels that answer it for many points at once
+        return self.level.observed(self.positions)
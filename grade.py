@@ -0,0 +1,108 @@
+"""
+Grades a whole directory of model files against one level without any interaction:
+
+    python grade.py Elevator submissions/ --timeout 10 > results.jsonl
+    python grade.py SimpleTime "session*/model.py" --format csv -j 8
+
+Every model is checked in a pool of worker processes (see model_pool.py) which already
+imported numpy and game_backend, and every result is written out as soon as it is ready.
+"""
+
+import argparse
+import csv
+import glob
+import json
+import os
+import sys
+
+from check_cache import CheckCache
+from model_pool import ModelError
+
+FIELDS = ["path", "passed", "trials", "seconds", "error", "failure"]
+
+def to_row(path, result, seconds):
+    row = {"path": path, "passed": False, "trials": 0, "seconds": round(seconds, 4), "error": None, "failure": None}
+    if isinstance(result, ModelError):
+        row["error"] = str(result) # already says what went wrong inside the model
+        return row
+    if isinstance(result, Exception):
+        row["error"] = f"{type(result).__name__}: {result}"
+        return row
+    row["passed"] = bool(result)
+    row["trials"] = getattr(result, "trials", None)
+    if not result:
+        row["failure"] = str(result)
+    return row
+
+def find_models(patterns):
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            paths += sorted(glob.glob(os.path.join(pattern, "**", "*.py"), recursive=True))
+        else:
+            paths += sorted(glob.glob(pattern, recursive=True))
+    return paths
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="check many model files against a level")
+    parser.add_argument("level", help="name of the level in game_backend, e.g. Elevator")
+    parser.add_argument("models", nargs="+", help="model files, directories or glob patterns")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count(), help="number of worker processes")
+    parser.add_argument("--timeout", type=float, default=30, help="seconds each model may take (0: no limit)")
+    parser.add_argument("--cpu-time", type=float, default=None, help="cpu seconds each model may use")
+    parser.add_argument("--trials", type=int, default=None, help="trials per model (default: the level's)")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the trials, the same for every model")
+    parser.add_argument("--no-cache", action="store_true", help="check every model again, even if it was checked before")
+    parser.add_argument("--format", choices=["jsonl", "csv"], default="jsonl")
+    parser.add_argument("-o", "--output", default="-", help="file to write the results to (default: stdout)")
+    args = parser.parse_args(argv)
+
+    import game_backend as gb
+    from model_pool import ModelPool
+    if not (isinstance(getattr(gb, args.level, None), type) and issubclass(getattr(gb, args.level), gb.Level)):
+        parser.error(f"unknown level: {args.level}")
+    paths = find_models(args.models)
+    if not paths:
+        parser.error("no model files found")
+
+    out = sys.stdout if args.output == "-" else open(args.output, "w", newline="")
+    writer = None
+    if args.format == "csv":
+        writer = csv.DictWriter(out, FIELDS)
+        writer.writeheader()
+
+    def emit(row):
+        if writer:
+            writer.writerow(row)
+        else:
+            out.write(json.dumps(row) + "\n")
+        out.flush()
+
+    failed = 0
+    level = getattr(gb, args.level)()
+    cache = None if args.no_cache else CheckCache()
+    keys, todo = {}, []
+    for path in paths:
+        if cache:
+            with open(path, "rb") as f:
+                keys[path] = cache.key(level, f.read(), args.seed, args.trials)
+            result = cache.get(keys[path])
+            if result is not None:
+                emit(to_row(path, result, 0.0))
+                failed += not result
+                continue
+        todo.append(path)
+
+    with ModelPool(args.workers, wall_time=args.timeout or None, cpu_time=args.cpu_time) as pool:
+        for path, result, seconds in pool.check_many(level, todo, trials=args.trials, seed=args.seed):
+            if cache and not isinstance(result, Exception):
+                cache.put(keys[path], result)
+            row = to_row(path, result, seconds)
+            failed += not row["passed"]
+            emit(row)
+    if out is not sys.stdout:
+        out.close()
+    print(f"{len(paths) - failed}/{len(paths)} models passed", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
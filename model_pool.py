@@ -0,0 +1,203 @@
+"""
+Runs model checks in pre-forked worker processes, so a model that never returns (or is just
+very slow) can not freeze the terminal or a grading run.
+
+The workers are forked from this process after numpy and game_backend are imported, so they
+start warm, and every check runs in a fork of its worker: it costs a few milliseconds and
+whatever a model changes (e.g. patching game_backend) can not reach the models checked after it.
+A check that runs out of wall clock time gets its worker killed and replaced by a freshly forked
+one, one that runs out of cpu time only loses its own fork.
+(A forkserver would re-run the main script in every worker, and game.py is all main script.)
+"""
+
+import contextlib
+import io
+import math
+import multiprocessing
+import os
+import signal
+import time
+from multiprocessing.connection import wait
+
+import numpy  # noqa: F401  imported here so that every worker starts with it
+import game_backend  # noqa: F401
+import terminal_interface
+
+
+class ModelError(Exception):
+    """ The model file could not be imported or the model raised during the check. """
+
+
+def _limit_cpu(seconds):
+    # cpu time limit of this process from now on, None lifts it again
+    try:
+        import resource
+    except ImportError: # not on every platform, the wall clock limit still applies
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    if seconds is None:
+        resource.setrlimit(resource.RLIMIT_CPU, (hard, hard))
+        return
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    limit = math.ceil(usage.ru_utime + usage.ru_stime + seconds)
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (limit, hard))
+
+def _kill(process):
+    # the worker and everything it started: a check with workers > 1 runs its shards in processes of its own
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except (AttributeError, OSError): # no process groups on this platform, or the group is gone already
+        process.kill()
+    process.join()
+
+def _run(conn, task):
+    # imports the model and checks it in this process, sends the progress and the result to `conn`
+    level, path, check_args, cpu_time, progress = task
+    start = time.perf_counter()
+    _limit_cpu(cpu_time)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()): # prints of the model are not ours to show
+            model = terminal_interface.import_model(path)
+            if progress and type(level).check is game_backend.Level.check:
+                for step in level.check_iter(model, **check_args):
+                    conn.send(("progress", step, time.perf_counter() - start))
+                reply = ("ok", step.result)
+            else: # levels with their own check can not report progress, and only check_iter takes a batch size
+                check_args.pop("batch", None)
+                reply = ("ok", level.check(model, **check_args))
+    except Exception as e:
+        reply = ("error", f"{type(e).__name__}: {e}")
+    _limit_cpu(None)
+    conn.send(reply + (time.perf_counter() - start,))
+
+def _serve(conn):
+    if hasattr(os, "setpgrp"):
+        os.setpgrp() # a group of its own, so _kill reaches the shard processes of a parallel check too
+    # ctrl-c in the terminal reaches us too, but cancelling a check is up to the parent
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    while True:
+        task = conn.recv()
+        if task is None:
+            return
+        if not hasattr(os, "fork"): # every model in this process, what one changes at module level the next ones see
+            _run(conn, task)
+            continue
+        # the worker is only the warm template: every check runs in a fresh fork of it, so a
+        # model that patches game_backend (or anything else) is gone again with its process
+        start = time.perf_counter()
+        child = os.fork()
+        if child == 0:
+            code = 1
+            try:
+                _run(conn, task)
+                code = 0
+            finally:
+                os._exit(code)
+        _, status = os.waitpid(child, 0)
+        if os.WIFSIGNALED(status) and os.WTERMSIG(status) in (signal.SIGXCPU, signal.SIGKILL):
+            conn.send(("timeout", "cpu time limit exceeded", time.perf_counter() - start))
+        elif status:
+            conn.send(("error", f"the check stopped with exit status {os.waitstatus_to_exitcode(status)}", time.perf_counter() - start))
+
+
+class ModelPool():
+    """ A fixed number of worker processes that check models with a time limit::
+
+            with ModelPool(workers=4, wall_time=10) as pool:
+                for path, result, seconds in pool.check_many(Elevator(), paths):
+                    ...
+
+    `result` is what level.check returned, or the exception (ModelError or TimeoutError)
+    that stopped the check. """
+    def __init__(self, workers: int = 1, wall_time: float = None, cpu_time: float = None):
+        self.wall_time = wall_time
+        self.cpu_time = cpu_time
+        self._context = multiprocessing.get_context("fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn")
+        self._workers = [self._start() for _ in range(workers)]
+
+    def _start(self):
+        conn, child_conn = self._context.Pipe()
+        # not a daemon: a check with workers > 1 starts processes of its own
+        process = self._context.Process(target=_serve, args=(child_conn,))
+        process.start()
+        child_conn.close()
+        return process, conn
+
+    def _replace(self, i):
+        process, conn = self._workers[i]
+        _kill(process)
+        conn.close()
+        self._workers[i] = self._start()
+
+    def check_many(self, level, paths, progress=None, **check_args):
+        """ Checks every model file in `paths`, yields (path, result, seconds) in the order they finish.
+        With a `progress` callback the workers use level.check_iter and every CheckProgress is passed
+        on as progress(path, step) while the check runs, except for levels with a check of their own,
+        which only send the result. """
+        pending = list(paths)[::-1]
+        busy = {} # connection -> (worker index, path, start time)
+        try:
+            while pending or busy:
+                for i, (process, conn) in enumerate(self._workers):
+                    if pending and conn not in busy:
+                        path = pending.pop()
+                        conn.send((level, path, check_args, self.cpu_time, progress is not None))
+                        busy[conn] = (i, path, time.perf_counter())
+
+                timeout = None
+                if self.wall_time:
+                    timeout = max(0, min(start for _, _, start in busy.values()) + self.wall_time - time.perf_counter())
+                for conn in wait(list(busy), timeout):
+                    i, path, start = busy[conn]
+                    try:
+                        status, value, seconds = conn.recv()
+                    except (EOFError, OSError): # the worker itself died, the checks only run in its forks
+                        del busy[conn]
+                        self._replace(i)
+                        yield path, ModelError("the worker process died"), time.perf_counter() - start
+                        continue
+                    if status == "progress":
+                        progress(path, value)
+                        continue
+                    del busy[conn]
+                    if status == "timeout":
+                        value = TimeoutError(value)
+                    elif status == "error":
+                        value = ModelError(value)
+                    yield path, value, seconds
+
+                now = time.perf_counter()
+                for conn, (i, path, start) in list(busy.items()):
+                    if self.wall_time and now - start >= self.wall_time:
+                        del busy[conn]
+                        self._replace(i)
+                        yield path, TimeoutError("time limit exceeded"), now - start
+        finally:
+            # results of abandoned checks would otherwise show up as answers to the next ones
+            for i, _, _ in busy.values():
+                self._replace(i)
+
+    def check(self, level, path, progress=None, **check_args):
+        """ level.check with the model in `path`, raises ModelError or TimeoutError. """
+        _, result, _ = next(self.check_many(level, [path], progress, **check_args))
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def close(self):
+        for process, conn in self._workers:
+            if process.is_alive():
+                conn.send(None)
+            process.join(1)
+            if process.is_alive():
+                _kill(process)
+            conn.close()
+        self._workers = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,196 @@
+"""
+Shows the walk of a terminal session in a plot window that stays open next to the prompt.
+
+The window runs in a process of its own with its own matplotlib event loop, the terminal only
+sends it what changed (new positions and saved points) over a pipe. Every batch of new positions
+becomes a line segment of its own that is drawn over a saved copy of the picture (blitting), so an
+update costs as much as the new positions and not the whole walk. Only resizing, zooming or a
+position outside the current axis limits draws everything again.
+"""
+
+import multiprocessing
+import signal
+
+import numpy as np
+
+
+def _non_interactive_backends():
+    try:
+        from matplotlib.backends import backend_registry, BackendFilter
+        return backend_registry.list_builtin(BackendFilter.NON_INTERACTIVE)
+    except ImportError: # matplotlib < 3.9
+        from matplotlib.rcsetup import non_interactive_bk
+        return [name.lower() for name in non_interactive_bk]
+
+
+class _Plot():
+    # the figure in the window process, with everything that is already drawn in `_background`
+    def __init__(self, dim, title):
+        import matplotlib.pyplot as plt
+        if plt.get_backend().lower() in _non_interactive_backends():
+            raise RuntimeError(f"no window can be opened here (matplotlib backend {plt.get_backend()})")
+        self.plt = plt
+        self.dims = 3 if dim == 3 else 2 # higher dimensions show their first two coordinates
+        self.figure = plt.figure()
+        if self.dims == 3:
+            self.axes = self.figure.add_subplot(111, projection="3d")
+            self.axes.set_xlabel("x"); self.axes.set_ylabel("y"); self.axes.set_zlabel("z")
+        else:
+            self.axes = self.figure.add_subplot(111)
+            self.axes.set_xlabel("x"); self.axes.set_ylabel("y"); self.axes.set_aspect("equal", adjustable="box")
+        self.axes.set_title(title)
+        self.axes.set_autoscale_on(False) # the limits only change in _fit, everything else is a blit
+        # the current position moves, so it is drawn over the background instead of into it
+        self.current = self.axes.plot(*np.zeros((self.dims, 1)), "o", color="red", label="current", animated=True)[0]
+        self.last = None # the newest position drawn, the next segment starts there
+        self.points = {} # name -> (marker, label) of the saved points
+        self.extent = None # smallest and largest coordinates drawn so far
+        self.limits = None
+        self.new = [] # artists that are not part of _background yet
+        self.redraw = True
+        self._background = None
+        self.figure.canvas.mpl_connect("draw_event", self._on_draw)
+        plt.show(block=False)
+
+    def is_open(self):
+        return self.plt.fignum_exists(self.figure.number)
+
+    def _on_draw(self, event):
+        # a full draw (the first one, resizing, zooming, rotating) has everything in it
+        self._background = self.figure.canvas.copy_from_bbox(self.figure.bbox)
+        self.new = []
+        self.axes.draw_artist(self.current)
+
+    def _fit(self, points):
+        low, high = points.min(axis=0), points.max(axis=0)
+        if self.limits is not None and (low >= self.limits[0]).all() and (high <= self.limits[1]).all():
+            return
+        if self.extent is not None:
+            low, high = np.minimum(low, self.extent[0]), np.maximum(high, self.extent[1])
+        self.extent = low, high
+        # room for half as much again on every side, so a walk that keeps going does not redraw everything every step
+        margin = np.maximum(high - low, 1) / 2
+        self.limits = low - margin, high + margin
+        for axis, (lower, upper) in zip("xyz", zip(*self.limits)):
+            getattr(self.axes, f"set_{axis}lim")(lower, upper)
+        self.redraw = True
+
+    def _place(self, artist, point):
+        if self.dims == 3:
+            artist.set_data_3d(*point[:, None])
+        else:
+            artist.set_data(*point[:, None])
+
+    def add_positions(self, positions):
+        positions = positions[:, :self.dims]
+        if not len(positions):
+            return
+        self._fit(positions)
+        if self.last is None:
+            self.new.append(self.axes.plot(*positions[:1].T, "o", color="green", label="start")[0])
+            self.axes.legend(handles=[self.new[-1], self.current])
+            self.redraw = True
+            segment = positions
+        else:
+            segment = np.concatenate([self.last[None], positions])
+        self.new.append(self.axes.plot(*segment.T, marker="o", linestyle="-", color="C0")[0])
+        self.last = positions[-1]
+        self._place(self.current, self.last)
+
+    def add_point(self, name, position):
+        position = position[:self.dims]
+        if name in self.points: # saved again somewhere else, the old marker has to be erased
+            for artist in self.points[name]:
+                artist.remove()
+            self.redraw = True
+        self._fit(position[None])
+        marker = self.axes.plot(*position[:, None], "x", color="black")[0]
+        label = self.axes.text(*position, " " + name)
+        self.points[name] = marker, label
+        self.new += [marker, label]
+
+    def update(self):
+        canvas = self.figure.canvas
+        if self.redraw or self._background is None or not getattr(canvas, "supports_blit", False):
+            self.redraw = False
+            canvas.draw_idle() # _on_draw takes it from there
+            return
+        canvas.restore_region(self._background)
+        for artist in self.new:
+            self.axes.draw_artist(artist)
+        self.new = []
+        self._background = canvas.copy_from_bbox(self.figure.bbox)
+        self.axes.draw_artist(self.current)
+        canvas.blit(self.figure.bbox)
+
+
+def _serve(conn, dim, title):
+    # ctrl-c in the terminal reaches us too, but it is meant for the prompt
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    try:
+        plot = _Plot(dim, title)
+    except Exception as e:
+        conn.send(("error", str(e)))
+        return
+    conn.send(("ready", None))
+    while plot.is_open():
+        if conn.poll(0.02):
+            try:
+                while conn.poll():
+                    message = conn.recv()
+                    if message is None:
+                        return
+                    getattr(plot, message[0])(*message[1:])
+            except EOFError: # the terminal is gone
+                return
+            plot.update()
+        plot.figure.canvas.flush_events()
+
+
+class PlotWindow():
+    """ A plot window in a process of its own that is told what changed::
+
+            window = PlotWindow(dim=2)
+            window.add_positions(history.array)
+            window.add_point("home", level.position)
+
+    Raises RuntimeError if no window can be opened, e.g. without a display. Once the
+    window was closed, everything sent to it is dropped. """
+    def __init__(self, dim: int, title: str = "Movement history", timeout: float = 30):
+        context = multiprocessing.get_context("fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn")
+        self._conn, child_conn = context.Pipe()
+        self._process = context.Process(target=_serve, args=(child_conn, dim, title), daemon=True)
+        self._process.start()
+        child_conn.close()
+        try:
+            status, message = self._conn.recv() if self._conn.poll(timeout) else ("error", "the plot window did not open")
+        except EOFError:
+            status, message = "error", "the plot window process died"
+        if status == "error":
+            self.close()
+            raise RuntimeError(message)
+
+    @property
+    def alive(self) -> bool:
+        return self._process.is_alive()
+
+    def _send(self, message):
+        try:
+            self._conn.send(message)
+        except OSError: # the window was closed
+            pass
+
+    def add_positions(self, positions): # appends the (k, dim) positions to the walk
+        self._send(("add_positions", np.array(positions, dtype=float).reshape(-1, np.shape(positions)[-1])))
+
+    def add_point(self, name: str, position):
+        self._send(("add_point", name, np.array(position, dtype=float)))
+
+    def close(self):
+        if self._process.is_alive():
+            self._send(None)
+            self._process.join(1)
+        if self._process.is_alive():
+            self._process.kill()
+            self._process.join()
+        self._conn.close()
@@ -0,0 +1,95 @@
+"""
+Measures how long starting the game takes, so an import that sneaks back into the startup path
+shows up before players notice it:
+
+    python startup_benchmark.py              # prints the times, exits with 1 if one is over budget
+    python startup_benchmark.py --runs 20 --importtime
+
+Every measurement starts a fresh interpreter. A time is the best of --runs, minus the same for a
+baseline (an interpreter that only imports numpy), so only what this repository adds is counted.
+The game is timed until it shows its first prompt, i.e. until a player can type. Besides the
+times, importing terminal_interface must not import the modules that only some commands need.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+PROMPT = b"> " # what the game shows when it waits for the first command
+
+# name -> (what to run, baseline to subtract, budget in seconds); both are timed until they show PROMPT,
+# so the time to shut the interpreter down is in neither of them
+BUDGETS = {
+    "game.py until its first prompt": (["game.py"], ["-c", "import numpy; print('> ')"], 0.1),
+    "import terminal_interface": (["-c", "import terminal_interface; print('> ')"], ["-c", "import numpy; print('> ')"], 0.05),
+}
+# only imported by the commands that need them
+LAZY_MODULES = ["matplotlib", "readline", "plot_window", "text_plot", "model_pool", "check_cache"]
+
+
+def until_prompt(args):
+    # seconds until the interpreter running `args` shows PROMPT (or exits), the text before it
+    # is read as it comes, so a process that prints a lot does not block on a full pipe
+    environment = dict(os.environ, PYTHONUNBUFFERED="1")
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable] + args, cwd=HERE, env=environment,
+                               stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    shown = b"" # the end of what was read so far
+    while PROMPT not in shown:
+        chunk = os.read(process.stdout.fileno(), 4096)
+        if not chunk:
+            break
+        shown = shown[-len(PROMPT):] + chunk
+    seconds = time.perf_counter() - start
+    process.kill()
+    process.wait()
+    process.stdout.close()
+    return seconds
+
+def best(args, runs):
+    return min(until_prompt(args) for _ in range(runs))
+
+def eagerly_imported():
+    code = f"import sys, terminal_interface; print(' '.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+    return subprocess.run([sys.executable, "-c", code], cwd=HERE, capture_output=True, text=True, check=True).stdout.split()
+
+def slowest_imports(module, count=10):
+    # the modules with the largest cumulative import time (python -X importtime)
+    log = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], cwd=HERE,
+                         capture_output=True, text=True).stderr
+    rows = []
+    for line in log.splitlines()[1:]:
+        _, own, cumulative, name = (part.strip() for part in line.replace(":", "|", 1).split("|"))
+        rows.append((int(cumulative), name))
+    return sorted(rows, reverse=True)[:count]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="measure the startup time of the game")
+    parser.add_argument("--runs", type=int, default=7, help="fresh interpreters per measurement, the fastest counts")
+    parser.add_argument("--importtime", action="store_true", help="also list the slowest imports of terminal_interface")
+    args = parser.parse_args(argv)
+
+    failed = False
+    for name, (command, baseline, budget) in BUDGETS.items():
+        total = best(command, args.runs)
+        seconds = max(total - best(baseline, args.runs), 0)
+        over = seconds > budget
+        failed |= over
+        print(f"{name:32} {1000 * seconds:7.1f} ms  ({1000 * total:.0f} ms with the baseline, budget {1000 * budget:.0f} ms)"
+              f"{'  OVER BUDGET' if over else ''}")
+    eager = eagerly_imported()
+    if eager:
+        failed = True
+        print("imported by terminal_interface although only some commands need them:", ", ".join(eager))
+    if args.importtime:
+        print("slowest imports of terminal_interface (cumulative):")
+        for microseconds, module in slowest_imports("terminal_interface"):
+            print(f"  {microseconds / 1000:7.1f} ms  {module}")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
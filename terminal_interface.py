@@ -5,41 +5,121 @@ Basically all of this was kindly provided by Github Copilot
 import sys
 import os
 import importlib.util
-import readline
 import numpy as np
-import matplotlib.pyplot as plt
 
 # local import
 import game_backend as gb
 
-def load_model_from_path(path):
+def import_model(path):
+    """ Imports the python file at `path` and returns its `model` function, raises ValueError
+    if there is none and whatever importing the file raises. """
     path = os.path.expanduser(path)
     if not os.path.isfile(path):
-        print("model file not found:", path)
-        return None
+        raise ValueError("model file not found: " + path)
     spec = importlib.util.spec_from_file_location("user_model", path)
     mod = importlib.util.module_from_spec(spec)
-    try:
-        spec.loader.exec_module(mod)
-    except Exception as e:
-        print("error importing model:", e)
-        return None
+    spec.loader.exec_module(mod)
     if not hasattr(mod, "model"):
-        print("module does not define 'model(position, movement)' function")
-        return None
+        raise ValueError("module does not define 'model(position, movement)' function")
     if not callable(mod.model):
-        print("'model' is not callable")
-        return None
+        raise ValueError("'model' is not callable")
     return mod.model
 
+def load_model_from_path(path):
+    try:
+        return import_model(path)
+    except ValueError as e:
+        print(e)
+    except Exception as e:
+        print("error importing model:", e)
+    return None
+
+class History():
+    """ The positions visited so far, in one preallocated (n, dim) array that grows by doubling.
+    With a `limit` it never holds more than that many: either only the most recent ones (a ring
+    buffer), or with thin=True the whole walk at a stride that doubles each time it fills up, plus
+    the newest position. `array` is a read only view, not a copy::
+
+            >>> history = History(2, limit=3)
+            >>> for x in range(5): history.append([x, 0])
+            >>> history.array[:, 0], history.total
+            (array([2., 3., 4.]), 5)
+    """
+    def __init__(self, dim: int, dtype=float, capacity: int = 64, limit: int = None, thin: bool = False):
+        if limit is not None and limit < 2:
+            raise ValueError("history limit must be at least 2")
+        self.limit = limit
+        self.thin = thin
+        self.total = 0 # positions appended so far, including the ones dropped again
+        # a ring buffer moves its rows back to the front only once every `limit` appends
+        self._max_rows = None if limit is None else limit + 1 if thin else 2 * limit
+        self._rows = np.empty((capacity if limit is None else min(capacity, self._max_rows), dim), dtype=dtype)
+        self._start = self._end = 0
+        self._stride = 1 # thinned out walks only keep every _stride-th position
+        self._pending = False # whether the last row is the newest position in between two of those
+
+    def __len__(self):
+        return self._end - self._start
+
+    def append(self, position):
+        if self._pending: # the newest position is only kept until the next one comes
+            self._end -= 1
+        if self._end == len(self._rows):
+            self._make_room()
+        self._rows[self._end] = position
+        self._end += 1
+        self.total += 1
+        self._pending = (self.total - 1) % self._stride != 0
+        if self.limit is not None and len(self) > self.limit:
+            if self.thin:
+                # every other position of the walk so far, and the newest one after them
+                newest = self._rows[self._end - 1].copy()
+                kept = self._rows[self._start:self._end - 1:2]
+                self._rows[:len(kept)] = kept
+                self._rows[len(kept)] = newest
+                self._start, self._end = 0, len(kept) + 1
+                self._stride *= 2
+                self._pending = (self.total - 1) % self._stride != 0
+            else:
+                self._start += 1
+
+    def _make_room(self):
+        n = len(self)
+        if self._max_rows is None or len(self._rows) < self._max_rows:
+            size = 2 * len(self._rows) if self._max_rows is None else min(2 * len(self._rows), self._max_rows)
+            rows = np.empty((size, self._rows.shape[1]), dtype=self._rows.dtype)
+        else:
+            rows = self._rows
+        rows[:n] = self._rows[self._start:self._end]
+        self._rows, self._start, self._end = rows, 0, n
+
+    @property
+    def array(self) -> np.ndarray:
+        # read only view of the kept positions, oldest first
+        rows = self._rows[self._start:self._end]
+        rows.flags.writeable = False
+        return rows
+
 class CLI:
     success = False # Flag used to stop the interface if a level was mastered
+    check_timeout = 60 # seconds a model may take in check before it is stopped
+    check_seed = None # seed of the trials check runs, None draws a new one every session so the trials are not always the same
+    history_limit = 2**20 # positions kept for plot, older parts of longer walks get thinned out (None: keep all)
+    plot_limit = 20000 # positions a plot gets at once, longer walks are downsampled to keep their shape
 
     def __init__(self, level):
         self.level = level
-        self.history = [self.level.position.copy()] # list of numpy positions
+        position = self.level.position
+        self.history = History(len(position), dtype=position.dtype, limit=self.history_limit, thin=True)
+        self.history.append(position)
+        self.pool = None # worker processes for check, started with the first one
+        if self.check_seed is None: # the same for the whole session, so checking an unchanged model file again is answered from the cache
+            self.check_seed = int.from_bytes(os.urandom(4), "little")
+        self.window = None # the plot window, opened by plot
+        self._project = None # positions -> the coordinates the plot window shows
 
     def start(self):
+        import readline  # noqa: F401  line editing for input(), only needed once there is a prompt
         print("Simple terminal interface for foundation-of-science-game")
         print("type 'help' for commands")
         print()
@@ -62,12 +142,16 @@ class CLI:
             if handler:
                 try:
                     handler(args)
-                    if self.success == True:
+                    if self.success:
                         break
                 except Exception as e:
                     print("error:", e)
             else:
                 print("unknown command:", cmd)
+        if self.pool is not None:
+            self.pool.close()
+        if self.window is not None:
+            self.window.close()
 
     def cmd_help(self, args):
         print("""commands:
@@ -75,10 +159,17 @@ class CLI:
   save NAME            - save current position under NAME
   angle LEFT RIGHT     - measure angle between saved points LEFT and RIGHT from current position (radians)
   length NAME          - vector from current position to saved point NAME
+  measure all [FILE]   - lengths to all saved points and angles between all pairs of them,
+                         optionally exported to FILE (.npz, together with the visited positions)
   show                 - show current position
-  plot                 - plot visited positions (2D or 3D depending on dimension)
-  check PATH           - load model from PATH (Python file with function model(position, movement))
-                         and run level.check(model)
+  plot [--text]        - plot visited positions (2D or 3D depending on dimension) in a window
+                         that stays open and follows your moves, or with --text right here
+                         in the terminal (add --ascii if braille characters do not show up)
+       [--axes I,J[,K]]  only show these axes of the positions
+       [--pca[=3]]       show the 2 (or 3) directions the walk spreads out the most in
+  check PATH [-j N]    - load model from PATH (Python file with function model(position, movement))
+                         and run level.check(model), optionally on N processes (-j 0: one per core)
+                         (ctrl-c cancels a running check)
   help                 - show this message
   exit | quit          - quit""")
         print(self.level.description())
@@ -101,8 +192,14 @@ class CLI:
         except ValueError:
             print("invalid numbers")
             return
-        self.level.move(vec)
-        self.history.append(self.level.position.copy())
+        try:
+            self.level.move(vec)
+        except ValueError as e: # e.g. half a step on a level with whole steps
+            print(e)
+            return
+        self.history.append(self.level.position)
+        if self.window is not None:
+            self.window.add_positions(self._project(self.level.position[None]))
         print("moved to", self.level.position)
 
     def cmd_save(self, args):
@@ -111,6 +208,8 @@ class CLI:
             return
         name = args[0]
         self.level.save_point(name)
+        if self.window is not None:
+            self.window.add_point(name, self._project(self.level.position[None])[0])
         print(f"saved current position as '{name}'")
 
     def cmd_angle(self, args):
@@ -137,65 +236,146 @@ class CLI:
             return
         print("vector to", name, "=", vec)
 
+    def cmd_measure(self, args):
+        if not args or args[0] != "all" or len(args) > 2:
+            print("usage: measure all [FILE]")
+            return
+        names = self.level.known_points.names
+        if not names:
+            print("no saved points")
+            return
+        lengths = self.level.measure_lengths()
+        angles = self.level.measure_angles()
+        if len(args) == 2:
+            np.savez(os.path.expanduser(args[1]), names=names, lengths=lengths, angles=angles, history=self.history.array)
+            print("saved measurements to", args[1])
+            return
+        print("saved points:", names)
+        print("lengths:")
+        for name, length in zip(names, lengths):
+            print(" ", name, "=", length)
+        print("angles (radians), rows and columns in the order above:")
+        print(np.array2string(angles, precision=4, suppress_small=True))
+
     def cmd_show(self, args):
         print("position:", self.level.position)
         if hasattr(self.level, "known_points"):
             print("saved points:", list(self.level.known_points.keys()))
 
     def cmd_plot(self, args):
-        dim = self.level.dim
-        hist = np.array(self.history)
+        text = ascii = False
+        axes = components = None
+        words = iter(args)
+        try:
+            for word in words:
+                if word in ("--text", "--ascii"):
+                    text, ascii = True, ascii or word == "--ascii"
+                elif word == "--axes":
+                    axes = [int(axis) for axis in next(words).split(",")]
+                elif word in ("--pca", "--pca=2", "--pca=3"):
+                    components = int(word[-1]) if "=" in word else 2
+                else:
+                    raise ValueError(word)
+        except (StopIteration, ValueError):
+            print("usage: plot [--text [--ascii]] [--axes I,J[,K] | --pca[=3]]")
+            return
+        dim = self.history.array.shape[1]
+        if axes is not None and (len(axes) not in (2, 3) or not all(0 <= axis < dim for axis in axes)):
+            print(f"--axes takes two or three of the axes 0 to {dim - 1}")
+            return
+        if self.window is not None and self.window.alive:
+            if axes is None and components is None and not text:
+                print("the plot window is already open, it follows your moves")
+                return
+            if not text: # a different view, in a new window
+                self.window.close()
+        hist = self.history.array
         if hist.shape[0] < 1:
             print("no history to plot")
             return
-        if dim == 2:
-            plt.figure()
-            plt.plot(hist[:, 0], hist[:, 1], marker="o", linestyle="-")
-            plt.scatter(hist[0, 0], hist[0, 1], c="green", label="start")
-            plt.scatter(hist[-1, 0], hist[-1, 1], c="red", label="current")
-            for name, pos in self.level.known_points.items():
-                p = np.array(pos)
-                plt.scatter(p[0], p[1], marker="x")
-                plt.text(p[0], p[1], " "+name)
-            plt.xlabel("x"); plt.ylabel("y"); plt.axis("equal"); plt.legend()
-            plt.title("Movement history (2D)")
-            plt.show()
-        elif dim == 3:
-            from mpl_toolkits.mplot3d import Axes3D  # noqa: F401
-            fig = plt.figure()
-            ax = fig.add_subplot(111, projection="3d")
-            ax.plot(hist[:, 0], hist[:, 1], hist[:, 2], marker="o")
-            ax.scatter([hist[0,0]], [hist[0,1]], [hist[0,2]], c="green", label="start")
-            ax.scatter([hist[-1,0]], [hist[-1,1]], [hist[-1,2]], c="red", label="current")
-            for name, pos in self.level.known_points.items():
-                p = np.array(pos)
-                ax.scatter([p[0]], [p[1]], [p[2]], marker="x")
-                ax.text(p[0], p[1], p[2], " "+name)
-            ax.set_xlabel("x"); ax.set_ylabel("y"); ax.set_zlabel("z")
-            plt.title("Movement history (3D)")
-            plt.show()
+        project, title = self._projection(axes, components)
+        shown = project(hist)
+        # however long the walk got, a plot only gets plot_limit positions that keep its shape
+        shown = shown[gb.downsample(shown, self.plot_limit)]
+        points = self.level.known_points
+        saved = project(points.array)
+        if text:
+            self.plot_text(shown, saved, points.names, ascii)
+            return
+        from plot_window import PlotWindow
+        try:
+            self.window = PlotWindow(shown.shape[1], title)
+        except RuntimeError as e:
+            print("can not open a plot window:", e)
+            print("(plot --text draws it right here)")
+            return
+        # from here on it only gets what changed, see cmd_move and cmd_save
+        self._project = project
+        self.window.add_positions(shown)
+        for name, p in zip(points.names, saved):
+            self.window.add_point(name, p)
+
+    def _projection(self, axes=None, components=None):
+        # the function that turns positions into the coordinates the plot shows, and a title that says which those are
+        hist = self.history.array
+        dim = hist.shape[1]
+        if components:
+            mean, directions = gb.principal_axes(np.concatenate([hist, self.level.known_points.array]), components)
+            return (lambda positions: (positions - mean) @ directions), f"Movement history ({components} principal components of dim={dim})"
+        if axes is not None:
+            title = f"Movement history (axes {', '.join(map(str, axes))} of dim={dim})"
+        elif dim <= 3:
+            axes, title = list(range(dim)), f"Movement history ({dim}D)"
         else:
-            # high-dim: show pairwise first two dims as fallback
-            plt.figure()
-            plt.plot(hist[:, 0], hist[:, 1], marker="o", linestyle="-")
-            plt.title(f"Movement history (first two dims of dim={dim})")
-            plt.show()
+            axes, title = [0, 1], f"Movement history (first two dims of dim={dim})"
+        return (lambda positions: np.asarray(positions, dtype=float)[:, axes]), title
+
+    def plot_text(self, path, points, names, ascii=False):
+        import shutil
+        from text_plot import render
+        columns, lines = shutil.get_terminal_size()
+        # a line for what is shown and one for the prompt
+        print(render(path, points, names, width=columns - 1, height=max(lines - 3, 5), braille=not ascii))
 
     def cmd_check(self, args):
-        if not args:
-            print("usage: check PATH_TO_MODEL_PY")
-            return
-        path = args[0]
-        model_func = load_model_from_path(path)
-        if model_func is None:
+        if len(args) not in (1, 3) or (len(args) == 3 and args[1] != "-j"):
+            print("usage: check PATH_TO_MODEL_PY [-j WORKERS]")
             return
+        path = os.path.expanduser(args[0])
+        workers = int(args[2]) if len(args) == 3 else 1
+        if self.pool is None:
+            from model_pool import ModelPool
+            self.pool = ModelPool(wall_time=self.check_timeout)
+        def show(path, step):
+            print(f"\rchecking: {step}", end="", flush=True)
+        def run(**check_args):
+            # the model runs in a worker process, so a model that never returns can not freeze us
+            if workers != 1: # a parallel check can not report progress
+                check_args["workers"] = workers or None
+                return self.pool.check(self.level, path, **check_args)
+            if type(self.level).check is not gb.Level.check: # levels with their own check can not report progress either
+                return self.pool.check(self.level, path, **check_args)
+            try: # small batches, so the progress moves while a plain model runs
+                return self.pool.check(self.level, path, progress=show, batch=20, **check_args)
+            finally:
+                print()
         try:
-            ok = self.level.check(model_func)
+            with open(path, "rb") as f:
+                source = f.read()
+            from check_cache import CheckCache
+            ok = CheckCache().check(self.level, source, run, seed=self.check_seed, shrink=True, workers=workers)
+        except KeyboardInterrupt:
+            print("check cancelled")
+            return
         except Exception as e:
             print("error running check:", e)
             return
         print("model check result:", ok)
-        self.success = ok
+        if getattr(ok, "coverage", None):
+            print("trials per region:", ok.coverage_report())
+        if not ok and hasattr(ok, "hint"):
+            print("hint:", ok.hint())
+        self.success = bool(ok)
 
 if __name__ == "__main__":
     cli = CLI(gb.Euclidean())
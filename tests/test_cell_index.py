@@ -0,0 +1,34 @@
+import numpy as np
+
+import game_backend as gb
+
+
+def test_cell_index_is_a_set():
+    rng = np.random.default_rng(4)
+    cells, reference, order = gb.CellIndex(3), set(), []
+    for _ in range(20): # enough to make the table grow a few times
+        new = rng.integers(-50, 50, (rng.integers(1, 200), 3))
+        if rng.random() < 0.5:
+            cells.update(new)
+        else:
+            for cell in new:
+                cells.add(cell)
+        for cell in map(tuple, new.tolist()):
+            if cell not in reference:
+                reference.add(cell)
+                order.append(cell)
+        probes = rng.integers(-60, 60, (500, 3))
+        assert len(cells) == len(reference)
+        np.testing.assert_array_equal(cells.contains(probes), [cell in reference for cell in map(tuple, probes.tolist())])
+        assert [list(cell) in cells for cell in order[-5:]] == [True] * min(5, len(order))
+    # insertion order, and rows point into it
+    assert list(map(tuple, cells.array.tolist())) == order
+    np.testing.assert_array_equal(cells.rows(np.array(order[::7])), np.arange(0, len(order), 7))
+    assert cells.row([1000, 0, 0]) == -1
+
+def test_observation_lookups_use_the_index():
+    level = gb.Observation(seed=3)
+    level.position = np.array([4, 5])
+    assert not level.observe(magic=1) and [4, 5] not in level.observations
+    assert level.observe(magic=0) and [4, 5] in level.observations
+    np.testing.assert_array_equal(level.observed([[4, 5], [5, 4]]), [True, False])
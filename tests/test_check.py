@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+
+import game_backend as gb
+
+
+def plain(level):
+    def model(position, movement):
+        return level.move_batch(np.array([position]), np.array([movement]))[0].tolist()
+    return model
+
+def vectorized(level):
+    def model(positions, movements):
+        return level.move_batch(positions, movements)
+    model.vectorized = True
+    return model
+
+def off_by_one(model):
+    def wrong(position, movement):
+        predicted = model(position, movement)
+        return [predicted[0] + (movement[0] > 0)] + list(predicted[1:]) # wrong about half the time
+    return wrong
+
+@pytest.mark.parametrize("make_level", [gb.Euclidean, gb.Elevator, gb.SimpleTime, gb.Spherical, gb.Hyperbolic])
+def test_vectorized_and_plain_models_get_the_same_result(make_level):
+    level = make_level()
+    assert level.check(plain(level), trials=500, seed=1)
+    assert level.check(vectorized(level), trials=500, seed=1)
+    wrong = off_by_one(plain(level))
+    def wrong_vectorized(positions, movements):
+        return np.array([wrong(p, m) for p, m in zip(positions.tolist(), movements.tolist())])
+    wrong_vectorized.vectorized = True
+    serial, batched = level.check(wrong, trials=500, seed=1), level.check(wrong_vectorized, trials=500, seed=1)
+    assert not serial and not batched
+    assert (serial.trial, serial.position, serial.movement) == (batched.trial, batched.position, batched.movement)
+
+def test_a_model_that_raises_fails_the_check():
+    result = gb.Spherical().check(lambda position, movement: 1 / 0)
+    assert not result and result.trial == 0
+    assert "ZeroDivisionError" in result.hint()
+
+    def picky(position, movement): # right until it meets a movement it does not like
+        if movement[0] > 5:
+            raise ValueError("too far")
+        return [a + b for a, b in zip(position, movement)]
+    result = gb.Euclidean().check(picky, seed=2)
+    assert not result and result.error == "ValueError: too far" and result.movement[0] > 5
+
+    def broken(positions, movements):
+        raise RuntimeError("no")
+    broken.vectorized = True
+    assert "RuntimeError: no" in str(gb.Euclidean().check(broken))
+
+def test_parallel_checks_are_reproducible():
+    level = gb.Elevator()
+    right = plain(level)
+    def rarely_wrong(position, movement): # wrong on a few trials, found by more than one shard
+        predicted = right(position, movement)
+        return predicted if movement[0] % 7 else [predicted[0] + 1] + predicted[1:]
+    results = [level.check(rarely_wrong, trials=4000, seed=3, workers=4) for _ in range(4)]
+    assert not results[0]
+    assert len({(r.shard, r.trial, str(r)) for r in results}) == 1
+    passed = level.check(right, trials=4000, seed=3, workers=4)
+    assert passed and passed.trials == 4000 and sum(passed.coverage.values()) == 4000
+
+def elevator(position, movement):
+    x, y, z = position[0] + movement[0], position[1] + movement[1], position[2]
+    return [x, y, 1 - z if (x, y) == (1, 2) else z]
+
+def test_exhaustive_checks_try_every_case():
+    level = gb.Elevator()
+    result = level.check_exhaustive(elevator)
+    assert result and result.trials == 21 * 21 * 2 * 21 * 21
+    # the only wrong cases are the ones that end on the elevator, the first one in order is found
+    def no_elevator(position, movement):
+        return [position[0] + movement[0], position[1] + movement[1], position[2]]
+    for chunk in (7, 2**16):
+        failed = level.check_exhaustive(no_elevator, ((-2, 2), (-2, 2), (0, 1)), (-3, 3), chunk=chunk)
+        assert not failed
+        # from [-2, -2, z] the elevator is out of reach, [-2, -1, 0] is the third position
+        assert (failed.position, failed.movement, failed.expected) == ([-2, -1, 0], [3, 3], [1, 2, 1])
+        assert failed.trial == 2 * 7 * 7 + 6 * 7 + 6
+
+def test_shrink_finds_the_smallest_counterexample():
+    def big_steps_go_too_far(position, movement):
+        return [position[0] + movement[0] + (movement[0] > 3), position[1] + movement[1], position[2] + movement[2]]
+    for seed in range(3):
+        result = gb.Euclidean().check(big_steps_go_too_far, seed=seed, shrink=True)
+        assert result.shrunk == {"position": [0, 0, 0], "movement": [4, 0, 0], "expected": [4, 0, 0], "predicted": [5, 0, 0]}
+        assert result.hint() == "starting at [0, 0, 0] and moving by [4, 0, 0] should end at [4, 0, 0], but the model says [5, 0, 0]"
+    # whatever the model returns (or raises) ends up in the hint instead of breaking it
+    assert gb.Euclidean().check(lambda position, movement: "x", seed=1, shrink=True).hint().endswith("the model says 'x'")
+    assert "it raises ZeroDivisionError" in gb.Elevator().check(lambda position, movement: 1 / 0, shrink=True).hint()
+
+def test_check_iter_reports_progress_and_can_be_stopped():
+    level = gb.Euclidean()
+    steps = list(level.check_iter(plain(level), trials=100, seed=1, batch=20))
+    assert [step.done for step in steps] == [20, 40, 60, 80, 100, 100]
+    assert all(step.result is None for step in steps[:-1]) and steps[-1].result
+    assert steps[-1].result.trials == 100 and steps[-1].rate == 1
+    for step in level.check_iter(plain(level), trials=100, seed=1, batch=20):
+        break # stopping to iterate cancels the check
+    assert step.done == 20
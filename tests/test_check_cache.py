@@ -0,0 +1,60 @@
+import os
+
+import game_backend as gb
+from check_cache import CheckCache
+
+SOURCE = "def model(p, m):\n    return [p[0] + m[0], p[1] + m[1], p[2]]\n"
+
+
+def counting(level, model):
+    calls = []
+    def run(**check_args):
+        calls.append(check_args)
+        return level.check(model, **check_args)
+    return run, calls
+
+def test_an_unchanged_model_is_checked_once(tmp_path):
+    cache, level = CheckCache(str(tmp_path)), gb.Elevator()
+    namespace = {}
+    exec(SOURCE, namespace)
+    run, calls = counting(level, namespace["model"])
+    first = cache.check(level, SOURCE, run, seed=4, shrink=True)
+    again = cache.check(level, SOURCE, run, seed=4, shrink=True)
+    assert len(calls) == 1
+    assert not first and not again # it misses the elevator
+    assert (again.position, again.movement, again.hint(), again.coverage) == (first.position, first.movement, first.hint(), first.coverage)
+    # anything that changes which trials run, or the model, is checked again
+    cache.check(level, SOURCE, run, seed=5, shrink=True)
+    cache.check(level, SOURCE, run, seed=4, trials=50, shrink=True)
+    cache.check(level, SOURCE, run, seed=4, shrink=True, workers=2)
+    cache.check(level, SOURCE + "\n", run, seed=4, shrink=True)
+    assert len(calls) == 5
+
+def test_the_key_covers_the_whole_level_setup(tmp_path):
+    cache = CheckCache(str(tmp_path))
+    def key(level):
+        return cache.key(level, SOURCE, 0)
+    assert key(gb.Euclidean()) != key(gb.Euclidean(dim=2))
+    assert key(gb.Wormholes([[[0, 0, 0], [1, 1, 0]]])) != key(gb.Wormholes([[[0, 0, 0], [2, 1, 0]]]))
+    assert key(gb.NObservation(1)) == key(gb.NObservation(1)) != key(gb.NObservation(2))
+    assert key(gb.Elevator()) != key(gb.Wormholes([[[1, 2, 0], [1, 2, 1]]])) # another class
+
+def test_levels_with_their_own_check_are_cached_too(tmp_path):
+    cache = CheckCache(str(tmp_path))
+    cache.put("passed", True)
+    cache.put("failed", False)
+    assert cache.get("passed") is True and cache.get("failed") is False and cache.get("unknown") is None
+
+def test_the_least_recently_used_entries_go_first(tmp_path):
+    result = gb.Euclidean().check(lambda p, m: p, seed=1)
+    cache = CheckCache(str(tmp_path))
+    cache.put("entry0", result)
+    size = (tmp_path / "entry0.json").stat().st_size
+    cache.max_bytes = 3 * size
+    for i in range(1, 3):
+        cache.put(f"entry{i}", result)
+    for i in range(3): # clearly apart, whatever the resolution of the file times
+        os.utime(tmp_path / f"entry{i}.json", (1000 + i, 1000 + i))
+    assert cache.get("entry0") is not None # now the most recently used one
+    cache.put("entry3", result)
+    assert [cache.get(f"entry{i}") is not None for i in range(4)] == [True, False, True, True]
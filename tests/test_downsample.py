@@ -0,0 +1,22 @@
+import numpy as np
+import pytest
+
+import game_backend as gb
+
+
+@pytest.mark.parametrize("dim", [1, 2, 3])
+def test_downsample_keeps_the_extremes_of_every_stretch(dim):
+    rng = np.random.default_rng(6)
+    path = np.cumsum(rng.normal(size=(10_007, dim)), axis=0)
+    limit = 200
+    kept = gb.downsample(path, limit)
+    buckets = (limit - 2) // (2 * dim)
+    size = -(-(len(path) - 2) // buckets)
+    expected = {0, len(path) - 1}
+    for start in range(1, len(path) - 1, size):
+        stretch = path[start:min(start + size, len(path) - 1)]
+        expected.update((start + stretch.argmin(axis=0)).tolist())
+        expected.update((start + stretch.argmax(axis=0)).tolist())
+    assert kept.tolist() == sorted(expected)
+    assert len(kept) <= limit
+    np.testing.assert_array_equal(gb.downsample(path[:limit], limit), np.arange(limit))
@@ -0,0 +1,18 @@
+import numpy as np
+
+from terminal_interface import History
+
+
+def test_history_is_what_was_appended():
+    walk = np.arange(1000.0)[:, None] * [1, -1]
+    everything, recent, thinned = History(2), History(2, limit=100), History(2, limit=100, thin=True)
+    for i, position in enumerate(walk):
+        for history in (everything, recent, thinned):
+            history.append(position)
+        np.testing.assert_array_equal(everything.array, walk[:i + 1])
+        np.testing.assert_array_equal(recent.array, walk[max(0, i - 99):i + 1])
+        # evenly spaced from the start, plus the newest position
+        rows = thinned.array[:, 0].astype(int)
+        assert len(rows) <= 100 and rows[0] == 0 and rows[-1] == i
+        assert len(set(np.diff(rows[:-1]).tolist())) <= 1
+    assert everything.total == recent.total == thinned.total == len(walk)
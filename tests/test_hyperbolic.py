@@ -0,0 +1,49 @@
+import numpy as np
+
+import game_backend as gb
+
+
+def boost(position, movement):
+    # the textbook Lorentz boost along the movement, fine near the origin
+    t, x = position[0], position[1:]
+    r = np.linalg.norm(movement)
+    s = movement * (np.sinh(r) / r if r else 1)
+    moved = x * np.cosh(r) + s + x * (x @ s) / (1 + t)
+    return np.array([np.sqrt(1 + moved @ moved), *moved])
+
+def test_hyperbolic_is_the_textbook_formulas():
+    rng = np.random.default_rng(5)
+    level = gb.Hyperbolic()
+    positions = gb.Hyperbolic._point(rng.uniform(0, 3, 500), rng.uniform(-4, 4, 500))
+    movements = rng.normal(size=(500, 2)) * 2
+    expected = np.array([boost(p, w) for p, w in zip(positions, movements)])
+    moved = level.move_batch(positions, movements)
+    np.testing.assert_allclose(moved, expected, rtol=1e-9, atol=1e-9 * np.abs(positions).max())
+    # a move covers its own length, and distances are arccosh of the minkowski product
+    np.testing.assert_allclose(gb.Hyperbolic._distance(positions, moved), np.hypot(*movements.T), atol=1e-9)
+    product = positions[:, 0] * moved[:, 0] - (positions[:, 1:] * moved[:, 1:]).sum(axis=1)
+    np.testing.assert_allclose(gb.Hyperbolic._distance(positions, moved), np.arccosh(np.maximum(product, 1)), atol=1e-6)
+
+def test_small_steps_far_from_the_origin_stay_accurate():
+    level = gb.Hyperbolic()
+    level.move(np.array([30.0, 0]))
+    far = level.position.copy() # coordinates around 5e12
+    for step in ([1e-3, 0], [0, 1e-3]):
+        level.position = far.copy()
+        level.move(np.array(step))
+        assert abs(gb.Hyperbolic._distance(far, level.position) - 1e-3) < 1e-12
+    level.position = far.copy() # and back along the same line
+    level.move(np.array([1e-3, 0]))
+    level.move(np.array([-1e-3, 0]))
+    assert gb.Hyperbolic._distance(far, level.position) < 1e-12
+
+def test_a_right_angle_is_measured_as_one():
+    level = gb.Hyperbolic()
+    level.save_point("o")
+    level.move(np.array([1.0, 0]))
+    level.save_point("a")
+    level.move(np.array([0, 1.0]))
+    level.save_point("b")
+    level.position = level.known_points["a"]
+    assert abs(level.measure_angle("o", "b") - np.pi / 2) < 1e-9
+    np.testing.assert_allclose(level.measure_lengths()[[0, 2]], [1, 1], atol=1e-9)
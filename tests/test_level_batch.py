@@ -0,0 +1,26 @@
+import numpy as np
+import pytest
+
+import game_backend as gb
+
+
+@pytest.mark.parametrize("make_level", [gb.Euclidean, gb.Elevator, gb.SimpleTime, gb.Spherical, gb.Hyperbolic])
+def test_level_batch_is_separate_levels(make_level):
+    rng = np.random.default_rng(3)
+    n = 5
+    batch, levels = gb.LevelBatch(make_level(), n), [make_level() for _ in range(n)]
+    for step in range(5):
+        if np.issubdtype(batch.level.dtype, np.integer):
+            movements = rng.integers(-3, 4, (n, batch.level.dim_move))
+        else:
+            movements = rng.normal(size=(n, batch.level.dim_move))
+        batch.move(movements)
+        for level, movement in zip(levels, movements):
+            level.move(movement)
+        np.testing.assert_allclose(batch.positions, [level.position for level in levels], rtol=1e-12, atol=1e-12)
+        if step < 4: # the last step moves away from every saved point
+            batch.save_point(f"p{step}")
+            for level in levels:
+                level.save_point(f"p{step}")
+    np.testing.assert_allclose(batch.measure_lengths(), [level.measure_lengths() for level in levels], atol=1e-9)
+    np.testing.assert_allclose(batch.measure_angles(), [level.measure_angles() for level in levels], atol=1e-9)
@@ -0,0 +1,43 @@
+import game_backend as gb
+from model_pool import ModelError, ModelPool
+
+RIGHT = "def model(p, m):\n    return [p[0] + m[0], p[1] + m[1]]\n"
+WRONG = "def model(p, m):\n    return [p[0] + m[0], p[1] - m[1]]\n"
+FOREVER = "def model(p, m):\n    while True:\n        pass\n"
+# passes every model checked after it, if it could reach them
+HACK = "import game_backend\ngame_backend.Level.compare_batch = lambda self, e, p: e[:, 0] == e[:, 0]\n" + WRONG
+
+
+def write(directory, **sources):
+    paths = {}
+    for name, source in sources.items():
+        paths[name] = directory / f"{name}.py"
+        paths[name].write_text(source)
+    return {name: str(path) for name, path in paths.items()}
+
+def test_models_that_take_too_long_are_stopped(tmp_path):
+    paths = write(tmp_path, forever=FOREVER, right=RIGHT)
+    with ModelPool(workers=1, wall_time=1) as pool:
+        results = {path: result for path, result, _ in pool.check_many(gb.Euclidean(dim=2), [paths["forever"], paths["right"]])}
+    assert isinstance(results[paths["forever"]], TimeoutError)
+    assert results[paths["right"]] # the worker that was killed got replaced
+
+def test_models_that_use_too_much_cpu_are_stopped(tmp_path):
+    paths = write(tmp_path, forever=FOREVER, right=RIGHT)
+    with ModelPool(workers=1, wall_time=20, cpu_time=1) as pool:
+        results = {path: result for path, result, _ in pool.check_many(gb.Euclidean(dim=2), [paths["forever"], paths["right"]])}
+    assert isinstance(results[paths["forever"]], TimeoutError)
+    assert results[paths["right"]]
+
+def test_one_model_can_not_change_the_check_of_the_next(tmp_path):
+    paths = write(tmp_path, hack=HACK, wrong=WRONG)
+    with ModelPool(workers=1, wall_time=10) as pool:
+        results = {path: result for path, result, _ in pool.check_many(gb.Euclidean(dim=2), [paths["hack"], paths["wrong"]])}
+    assert not results[paths["wrong"]]
+
+def test_broken_model_files_are_model_errors(tmp_path):
+    paths = write(tmp_path, syntax="def model(p, m)\n", missing="x = 1\n")
+    with ModelPool(workers=1, wall_time=10) as pool:
+        for path in paths.values():
+            result = next(pool.check_many(gb.Euclidean(dim=2), [path]))[1]
+            assert isinstance(result, ModelError)
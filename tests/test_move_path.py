@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+import game_backend as gb
+
+
+def moved_one_by_one(level, movements):
+    visited = []
+    for movement in movements:
+        level.move(movement)
+        visited.append(np.array(level.position, copy=True))
+    return np.array(visited)
+
+@pytest.mark.parametrize("scale", [0.01, 0.3, 3])
+def test_spherical_move_path_is_move(scale):
+    rng = np.random.default_rng(1)
+    for _ in range(10):
+        movements = rng.normal(0, scale, (2000, 2))
+        movements[:, 0] += rng.choice([0, 0.5, -0.5]) # drift over θ = 0 in both directions
+        stepped, whole = gb.Spherical(), gb.Spherical()
+        # exactly the same values, also where θ wraps around and φ crosses a pole
+        np.testing.assert_array_equal(whole.move_path(movements), moved_one_by_one(stepped, movements))
+        np.testing.assert_array_equal(whole.position, stepped.position)
+
+@pytest.mark.parametrize("make_level", [lambda: gb.Euclidean(dim=3), gb.Elevator, gb.SimpleTime, gb.Hyperbolic])
+def test_move_path_is_move(make_level):
+    rng = np.random.default_rng(2)
+    stepped, whole = make_level(), make_level()
+    if np.issubdtype(whole.dtype, np.integer):
+        movements = rng.integers(-3, 4, (500, whole.dim_move))
+    else:
+        movements = rng.normal(size=(500, whole.dim_move))
+    np.testing.assert_array_equal(whole.move_path(movements), moved_one_by_one(stepped, movements))
+    np.testing.assert_array_equal(whole.position, stepped.position)
+
+def test_move_path_of_nothing():
+    level = gb.Euclidean(dim=2)
+    assert level.move_path(np.empty((0, 2), dtype=np.int64)).shape == (0, 2)
+    np.testing.assert_array_equal(level.position, [0, 0])
@@ -0,0 +1,29 @@
+import numpy as np
+
+import game_backend as gb
+
+
+def test_saved_points_do_not_change_when_saved_again():
+    level = gb.Euclidean()
+    level.save_point("a")
+    point, values, items = level.known_points["a"], level.known_points.values(), dict(level.known_points.items())
+    level.move(np.array([1, 1, 1]))
+    level.save_point("a")
+    for old in (point, values[0], items["a"]):
+        np.testing.assert_array_equal(old, [0, 0, 0])
+    np.testing.assert_array_equal(level.known_points["a"], [1, 1, 1])
+
+def test_point_store_is_a_dict_of_rows():
+    rng = np.random.default_rng(7)
+    points, reference = gb.PointStore(3, dtype=np.int64), {}
+    for _ in range(200): # grows past its capacity a few times, and overwrites some names
+        name = f"p{rng.integers(60)}"
+        point = rng.integers(-100, 100, 3)
+        points[name] = point
+        reference[name] = point
+    assert points.names == list(reference) and len(points) == len(reference)
+    for row, (name, point) in enumerate(reference.items()):
+        np.testing.assert_array_equal(points[name], point)
+        np.testing.assert_array_equal(points.array[row], point)
+        assert points.row(name) == row
+    assert not points.array.flags.writeable
@@ -0,0 +1,42 @@
+import numpy as np
+
+import game_backend as gb
+
+
+def normalized_step_by_step(theta, phi):
+    # reflect at the poles one crossing at a time, turning the azimuth by π each time
+    while phi < 0 or phi > np.pi:
+        phi = -phi if phi < 0 else 2 * np.pi - phi
+        theta += np.pi
+    return np.mod(theta, 2 * np.pi), phi
+
+def test_normalize_is_reflecting_one_pole_at_a_time():
+    rng = np.random.default_rng(8)
+    theta, phi = rng.uniform(-20, 20, 2000), rng.uniform(-20, 20, 2000)
+    theta[:5], phi[:5] = 0, [0, np.pi, -np.pi, 2 * np.pi, 3 * np.pi] # exactly on the poles
+    closed_theta, closed_phi = gb.Spherical._normalize(theta, phi)
+    expected = np.array([normalized_step_by_step(t, p) for t, p in zip(theta, phi)])
+    # the same point on the sphere, which compares θ modulo 2π
+    np.testing.assert_allclose(closed_phi, expected[:, 1], atol=1e-9)
+    difference = np.mod(closed_theta - expected[:, 0] + np.pi, 2 * np.pi) - np.pi
+    np.testing.assert_allclose(np.where(np.sin(closed_phi) > 1e-9, difference, 0), 0, atol=1e-9)
+    assert ((closed_theta >= 0) & (closed_theta < 2 * np.pi)).all()
+    assert ((closed_phi >= 0) & (closed_phi <= np.pi)).all()
+
+def test_normalize_gives_the_same_for_scalars_and_arrays():
+    rng = np.random.default_rng(9)
+    theta, phi = rng.uniform(-20, 20, 200), rng.uniform(-20, 20, 200)
+    whole = np.column_stack(gb.Spherical._normalize(theta, phi))
+    one_by_one = np.array([gb.Spherical._normalize(t, p) for t, p in zip(theta, phi)])
+    np.testing.assert_array_equal(whole, one_by_one)
+
+def test_move_batch_is_move():
+    rng = np.random.default_rng(10)
+    positions = np.column_stack([rng.uniform(0, 2 * np.pi, 500), rng.uniform(0, np.pi, 500), np.ones(500)])
+    movements = rng.normal(0, 3, (500, 2))
+    moved = gb.Spherical().move_batch(positions, movements)
+    for position, movement, expected in zip(positions, movements, moved):
+        level = gb.Spherical()
+        level.position[:2] = position[:2]
+        level.move(movement)
+        np.testing.assert_allclose(level.position, expected[:2], atol=1e-12) # positions of a check also carry the radius
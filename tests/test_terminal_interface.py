@@ -0,0 +1,17 @@
+import game_backend as gb
+from terminal_interface import CLI
+
+OBSERVING = "def model(p, m, objs):\n    q = [p[0] + m[0], p[1] + m[1]]\n    return q, q in objs\n"
+
+
+def test_check_in_the_terminal_uses_a_levels_own_check(tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv("FOUNDATION_OF_SCIENCE_CACHE", str(tmp_path / "cache"))
+    path = tmp_path / "model.py"
+    path.write_text(OBSERVING)
+    cli = CLI(gb.NObservation(seed=1))
+    try:
+        cli.cmd_check([str(path)])
+    finally:
+        cli.pool.close()
+    assert "model check result: passed" in capsys.readouterr().out
+    assert cli.success
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+import game_backend as gb
+
+PORTALS = [[[0, 0, 0], [3, 3, 0]], [[1, 0, 0], [-2, 5, 1]]]
+
+
+def test_arriving_on_a_portal_end_puts_you_on_the_other_end():
+    level = gb.Wormholes(PORTALS)
+    level.move(np.array([3, 3]))
+    np.testing.assert_array_equal(level.position, [0, 0, 0]) # and back, it leads both ways
+    level.move(np.array([1, 0]))
+    np.testing.assert_array_equal(level.position, [-2, 5, 1])
+    level.move(np.array([0, 1]))
+    np.testing.assert_array_equal(level.position, [-2, 6, 1]) # leaving it is an ordinary step
+
+def test_teleport_is_a_lookup_in_the_portal_list():
+    rng = np.random.default_rng(11)
+    ends = rng.permutation(np.array(np.meshgrid(range(40), range(40), [0, 1])).reshape(3, -1).T)[:600]
+    level = gb.Wormholes(ends.reshape(-1, 2, 3))
+    exits = {tuple(a): b for a, b in zip(ends[0::2].tolist(), ends[1::2].tolist())}
+    exits.update({tuple(b): a for a, b in zip(ends[0::2].tolist(), ends[1::2].tolist())})
+    positions = rng.integers(-1, 41, (5000, 2))
+    positions = np.column_stack([positions, rng.integers(0, 2, 5000)])
+    moved = level.move_batch(positions, np.zeros((5000, 2), dtype=np.int64))
+    np.testing.assert_array_equal(moved, [exits.get(tuple(p), p) for p in positions.tolist()])
+
+def test_move_path_is_move():
+    rng = np.random.default_rng(2)
+    stepped, whole = gb.Wormholes(PORTALS), gb.Wormholes(PORTALS)
+    movements = rng.integers(-3, 4, (500, 2))
+    visited = []
+    for movement in movements:
+        stepped.move(movement)
+        visited.append(stepped.position.copy())
+    np.testing.assert_array_equal(whole.move_path(movements), visited)
+
+def test_a_cell_is_the_end_of_one_portal_only():
+    with pytest.raises(ValueError):
+        gb.Wormholes([[[0, 0, 0], [1, 1, 0]], [[1, 1, 0], [2, 2, 0]]])
+    level = gb.Wormholes(PORTALS)
+    with pytest.raises(ValueError):
+        level.add_portals([[[3, 3, 0], [9, 9, 0]]])
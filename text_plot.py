@@ -0,0 +1,92 @@
+"""
+Draws a walk and its saved points as text, for terminals that can not open a plot window
+(e.g. over ssh), without importing matplotlib:
+
+    print(render(history, level.known_points.array, level.known_points.names))
+
+Every character holds 2x4 pixels as a braille pattern (or a single pixel with braille=False),
+and the whole path is turned into pixels with a few numpy calls: the lines between consecutive
+positions are sampled at pixel spacing, binned into the pixel grid and the pixels of every
+character packed into its braille bits. 3D walks are shown as seen from the side at an angle,
+higher dimensional ones by their first two coordinates.
+"""
+
+import numpy as np
+
+# bit of the braille pattern for the pixel in row r (top to bottom) and column c of a character
+_BRAILLE_BITS = np.array([[0x01, 0x08], [0x02, 0x10], [0x04, 0x20], [0x40, 0x80]])
+
+
+def project(positions, view=(-60, 30)):
+    """ 2D coordinates of (n, dim) positions as drawn: 2D ones as they are, 3D ones seen from
+    `view` = (azimuth, elevation) in degrees (like a 3D plot in matplotlib), and of higher
+    dimensional ones the first two coordinates. """
+    positions = np.asarray(positions, dtype=float)
+    if positions.shape[1] != 3:
+        return positions[:, :2]
+    azimuth, elevation = np.radians(view)
+    x, y, z = positions.T
+    across = y * np.cos(azimuth) - x * np.sin(azimuth)
+    depth = x * np.cos(azimuth) + y * np.sin(azimuth)
+    return np.column_stack([across, z * np.cos(elevation) - depth * np.sin(elevation)])
+
+def _lines(pixels):
+    # points on the lines between consecutive pixel positions, about one per pixel
+    steps = np.maximum(np.ceil(np.abs(np.diff(pixels, axis=0)).max(axis=1, initial=0)), 1).astype(np.int64)
+    segment = np.repeat(np.arange(len(steps)), steps)
+    along = np.arange(steps.sum()) - np.repeat(np.cumsum(steps) - steps, steps)
+    t = (along / steps[segment])[:, None]
+    points = pixels[segment] * (1 - t) + pixels[segment + 1] * t
+    return np.concatenate([points, pixels[-1:]])
+
+def render(path, points=(), names=(), width: int = 80, height: int = 24, braille: bool = True, view=(-60, 30)) -> str:
+    """ The (n, dim) `path` with its start (o) and end (@) and the saved `points` (x) with their
+    `names` on a canvas of `width` x `height` characters, followed by one line that says what
+    is shown. Both axes have the same scale. """
+    path = np.asarray(path, dtype=float)
+    shown = project(path, view)
+    saved = project(np.asarray(points, dtype=float).reshape(-1, path.shape[1]), view)
+    everything = np.concatenate([shown, saved])
+    low, high = everything.min(axis=0), everything.max(axis=0)
+
+    cell_width, cell_height = (2, 4) if braille else (1, 1)
+    size = np.array([width * cell_width, height * cell_height])
+    # a character is about twice as high as it is wide, a braille pixel about as high as wide
+    aspect = np.array([1, 1 if braille else 2])
+    span = np.maximum(high - low, 1e-12)
+    scale = np.min((size - 1) * aspect / span) # pixels per unit, the same on both axes
+    offset = ((size - 1) * aspect - span * scale) / 2 # centred on the canvas
+    def to_pixels(coordinates):
+        return ((coordinates - low) * scale + offset) / aspect
+
+    pixels = np.rint(_lines(to_pixels(shown))).astype(np.int64)
+    canvas = np.zeros(size[::-1], dtype=bool)
+    canvas[size[1] - 1 - pixels[:, 1], pixels[:, 0]] = True
+    if braille:
+        cells = canvas.reshape(height, 4, width, 2)
+        codes = (cells * _BRAILLE_BITS[None, :, None, :]).sum(axis=(1, 3))
+        text = np.where(codes > 0, codes + 0x2800, ord(" "))
+    else:
+        text = np.where(canvas, ord("."), ord(" "))
+    text = text.astype(np.int64)
+
+    def mark(coordinates, symbol, label=""):
+        column, row = np.rint(to_pixels(coordinates)).astype(np.int64) // [cell_width, cell_height]
+        row = height - 1 - row
+        for i, char in enumerate(symbol + label):
+            if column + i < width:
+                text[row, column + i] = ord(char)
+    for name, point in zip(names, saved):
+        mark(point, "x", " " + name)
+    mark(shown[0], "o")
+    mark(shown[-1], "@")
+
+    lines = ["".join(map(chr, row)).rstrip() for row in text]
+    if path.shape[1] == 3:
+        what = f"3D seen from azimuth {view[0]}°, elevation {view[1]}°"
+    else:
+        what = f"x from {low[0]:.4g} to {high[0]:.4g}, y from {low[1]:.4g} to {high[1]:.4g}"
+        if path.shape[1] > 3:
+            what += f" (first two of {path.shape[1]} dimensions)"
+    lines.append(f"o start, @ current, x saved points; {what}")
+    return "\n".join(lines)